@@ -1,9 +1,54 @@
+import asyncio
+import atexit
+import collections
+import sys
+
 from gdmongolite.core import DBSingleton
 
+# Hooks run on every query, so they only append to a bounded in-memory
+# buffer; a background task writes the buffered lines out in one go.
+_log_queue = collections.deque(maxlen=10_000)
+_flush_task = None
+FLUSH_INTERVAL = 0.05  # seconds
+
+
+def _flush():
+    """Write all buffered log lines with a single write call"""
+    batch = []
+    while _log_queue:
+        batch.append(_log_queue.popleft())
+    if batch:
+        sys.stderr.write("".join(batch))
+        sys.stderr.flush()
+
+
+async def _flush_logs():
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        _flush()
+
+
+def _ensure_flusher():
+    """Start the flush task on the running loop, if there is one"""
+    global _flush_task
+    if _flush_task is not None and not _flush_task.done():
+        return
+    try:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_logs())
+    except RuntimeError:
+        _flush()  # No running loop (sync code) - write the lines right away
+
+
+atexit.register(_flush)
+
+
 @DBSingleton.on("pre_query")
 def log_pre(collection, filt, opts):
-    print(f"Querying {collection}: {filt}")
+    _log_queue.append(f"Querying {collection}: {filt}\n")
+    _ensure_flusher()
+
 
 @DBSingleton.on("post_query")
 def log_post(collection, result):
-    print(f"{collection} query completed.")
+    _log_queue.append(f"{collection} query completed.\n")
+    _ensure_flusher()
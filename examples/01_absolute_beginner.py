@@ -216,6 +216,9 @@ async def main():
     print("RUNNING ALL EXAMPLES...")
     print("="*50)
     
+    # Index the hobbies list once so hobbies__contains can use it
+    await db.User.create_index("hobbies")
+    
     await save_users()
     await find_users()
     await update_users()
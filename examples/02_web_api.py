@@ -12,6 +12,10 @@ What you'll learn:
 - Deploy to production
 """
 
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
 from gdmongolite import DB, Schema, Email, FieldTypes, create_fastapi_app, quick_serve
 
 # Step 1: Define your data models
@@ -38,8 +42,7 @@ class Order(Schema):
     status: str = "pending"  # pending, confirmed, shipped, delivered
 
 # Register schemas
-for schema in [User, Product, Order]:
-    db.register_schema(schema)
+db.register_schemas(User, Product, Order)
 
 # Step 2: Create FastAPI app (ONE LINE!)
 app = create_fastapi_app(
@@ -63,9 +66,16 @@ async def welcome():
 @app.get("/users/stats")
 async def user_stats():
     """Get user statistics"""
-    total = await db.User.find().count()
-    active = await db.User.find(is_active=True).count()
-    admins = await db.User.find(role="admin").count()
+    # One $facet aggregation returns all three counts in a single round-trip
+    stats = await (db.User.aggregate()
+                   .facet(
+                       total=[{"$count": "n"}],
+                       active=[{"$match": {"is_active": True}}, {"$count": "n"}],
+                       admins=[{"$match": {"role": "admin"}}, {"$count": "n"}]
+                   )
+                   .execute())
+    counts = {name: (rows[0]["n"] if rows else 0) for name, rows in stats[0].items()}
+    total, active, admins = counts["total"], counts["active"], counts["admins"]
     
     return {
         "total_users": total,
@@ -83,15 +93,27 @@ async def product_categories():
 @app.post("/orders/calculate")
 async def calculate_order(product_ids: list[str]):
     """Calculate order total"""
+    # Validate every id before touching the database
+    try:
+        oids = [ObjectId(pid) for pid in product_ids]
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=f"Invalid product id: {e}") from e
+    
+    # Fetch every product with one $in query instead of one query per id,
+    # keeping only name/price as the batches stream in
+    by_id = {}
+    cursor = db.Product.find(_id__in=oids).project("name", "price").batch_size(500)
+    async for doc in cursor:
+        by_id[doc["_id"]] = (doc["name"], doc["price"])
+    
+    # Walk the requested ids so order (and repeated ids) are preserved
     total = 0
     products = []
-    
-    for product_id in product_ids:
-        from bson import ObjectId
-        product = await db.Product.find(_id=ObjectId(product_id)).first()
-        if product:
-            total += product["price"]
-            products.append(product["name"])
+    for oid in oids:
+        if oid in by_id:
+            name, price = by_id[oid]
+            total += price
+            products.append(name)
     
     return {
         "products": products,
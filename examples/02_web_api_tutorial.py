@@ -18,6 +18,8 @@ from gdmongolite import (
     create_fastapi_app, quick_serve,
     FastAPIIntegration
 )
+import asyncio
+from functools import lru_cache
 from typing import List, Optional
 from datetime import datetime
 
@@ -115,18 +117,33 @@ def create_instant_api():
     
     return app
 
+# Fields needed to list posts - leaves out the (potentially large) content
+POST_PREVIEW_FIELDS = ("title", "author_email", "created_at", "tags")
+
 # Step 3: Add custom endpoints (make it your own!)
 print("\n🎨 ADDING CUSTOM ENDPOINTS...")
 
 def add_custom_endpoints(app):
     """Add your own custom API endpoints"""
     
+    # Index the tags list once so tags__contains lookups can use it
+    @app.on_event("startup")
+    async def create_indexes():
+        await db.Post.create_index("tags")
+    
     # Custom endpoint: Get user statistics
     @app.get("/api/user-stats")
     async def get_user_stats():
         """Get user statistics"""
-        total_users = await db.User.find().count()
-        active_users = await db.User.find(is_active=True).count()
+        # Both counts come back from a single $facet aggregation
+        stats = await (db.User.aggregate()
+                       .facet(
+                           total=[{"$count": "n"}],
+                           active=[{"$match": {"is_active": True}}, {"$count": "n"}]
+                       )
+                       .execute())
+        total_users = stats[0]["total"][0]["n"] if stats[0]["total"] else 0
+        active_users = stats[0]["active"][0]["n"] if stats[0]["active"] else 0
         
         return {
             "total_users": total_users,
@@ -136,10 +153,16 @@ def add_custom_endpoints(app):
     
     # Custom endpoint: Get popular posts
     @app.get("/api/popular-posts")
-    async def get_popular_posts(limit: int = 10):
-        """Get most popular posts"""
+    async def get_popular_posts(limit: int = 10, fields: Optional[str] = None):
+        """Get most popular posts
+        
+        Pass ?fields=title,content to choose the returned fields; by default
+        only the preview fields are sent (not the full post content).
+        """
+        selected = fields.split(",") if fields else POST_PREVIEW_FIELDS
         posts = await (db.Post
                       .find(published=True)
+                      .project(*selected)
                       .sort("-created_at")
                       .limit(limit)
                       .to_list())
@@ -153,7 +176,10 @@ def add_custom_endpoints(app):
     @app.get("/api/posts/by-tag/{tag}")
     async def get_posts_by_tag(tag: str):
         """Get posts by specific tag"""
-        posts = await db.Post.find(tags__contains=tag, published=True).to_list()
+        posts = await (db.Post
+                      .find(tags__contains=tag, published=True)
+                      .project(*POST_PREVIEW_FIELDS)
+                      .to_list())
         
         return {
             "tag": tag,
@@ -166,26 +192,33 @@ def add_custom_endpoints(app):
     async def get_user_dashboard(user_email: str):
         """Get user's dashboard data"""
         
-        # Get user info
-        user = await db.User.find(email=user_email).first()
+        # The three lookups are independent, so run them concurrently.
+        # Posts and comments are only counted, so let the server do it
+        # instead of shipping every document over the wire.
+        user, post_groups, comment_total = await asyncio.gather(
+            db.User.find(email=user_email).first(),
+            (db.Post.aggregate()
+             .match(author_email=user_email)
+             .group("$published", n={"$sum": 1})
+             .execute()),
+            db.Comment.find(author_email=user_email).count()
+        )
         if not user:
             return {"error": "User not found"}
         
-        # Get user's posts
-        posts = await db.Post.find(author_email=user_email).to_list()
-        
-        # Get user's comments
-        comments = await db.Comment.find(author_email=user_email).to_list()
+        by_status = {group["_id"]: group["n"] for group in post_groups}
+        published = by_status.get(True, 0)
+        drafts = by_status.get(False, 0)
         
         return {
             "user": user,
             "posts": {
-                "total": len(posts),
-                "published": len([p for p in posts if p["published"]]),
-                "drafts": len([p for p in posts if not p["published"]])
+                "total": published + drafts,
+                "published": published,
+                "drafts": drafts
             },
             "comments": {
-                "total": len(comments)
+                "total": comment_total
             }
         }
     
@@ -199,6 +232,30 @@ def add_custom_endpoints(app):
 # Step 4: Advanced API features
 print("\n🎓 ADVANCED API FEATURES...")
 
+# Searchable models: model name -> (schema, (field, operator) search terms).
+# Terms are ordered most selective first. Matches are case-insensitive
+# substrings, so searching for a domain still finds users by email.
+_SEARCH_MODELS = {
+    "user": (User, (("email", "contains"), ("name", "contains"), ("bio", "contains"))),
+    "post": (Post, (("title", "contains"), ("tags", "eq"), ("content", "contains"))),
+    "comment": (Comment, (("content", "contains"),)),
+}
+
+@lru_cache(maxsize=1024)
+def _build_search_filter(model: str, query: Optional[str]) -> dict:
+    """Build the advanced-search filter for a model, cached per (model, query)
+    
+    The result is shared between requests, so treat it as read-only.
+    find() compiles it into a fresh MongoDB query, so the driver never
+    sees (or mutates) the cached dict.
+    """
+    if not query:
+        return {}
+    
+    _, terms = _SEARCH_MODELS[model]
+    conditions = [{f"{field}__{op}": query} for field, op in terms]
+    return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
 def create_advanced_api():
     """Create API with advanced features"""
     
@@ -247,47 +304,32 @@ def create_advanced_api():
         """Advanced search with pagination and sorting"""
         
         # Select model
-        if model == "user":
-            schema = db.User
-        elif model == "post":
-            schema = db.Post
-        elif model == "comment":
-            schema = db.Comment
-        else:
+        if model not in _SEARCH_MODELS:
             raise HTTPException(status_code=400, detail="Invalid model")
+        schema, _ = _SEARCH_MODELS[model]
         
         # Build query
-        filters = {}
-        if query:
-            # Search in multiple fields based on model
-            if model == "user":
-                filters = {"$or": [
-                    {"name__contains": query},
-                    {"email__contains": query},
-                    {"bio__contains": query}
-                ]}
-            elif model == "post":
-                filters = {"$or": [
-                    {"title__contains": query},
-                    {"content__contains": query},
-                    {"tags__contains": query}
-                ]}
-            elif model == "comment":
-                filters = {"content__contains": query}
+        filters = _build_search_filter(model, query)
         
-        # Execute query
-        cursor = schema.find(**filters)
-        
-        # Apply sorting
+        # Fetch the page and the total count in one round-trip with $facet.
+        # $sort goes before $facet: sub-pipelines can't use indexes.
         sort_direction = -1 if sort_order == "desc" else 1
-        cursor = cursor.sort(**{sort_by: sort_direction})
-        
-        # Get total count
-        total = await cursor.count()
-        
-        # Apply pagination
         skip = (page - 1) * per_page
-        results = await cursor.skip(skip).limit(per_page).to_list()
+        docs = await (schema.aggregate()
+                      .match(**filters)
+                      .sort(**{sort_by: sort_direction})
+                      .facet(
+                          rows=[
+                              {"$skip": skip},
+                              {"$limit": per_page},
+                              # Search results are previews - skip post bodies
+                              *([{"$project": {"content": 0}}] if model == "post" else [])
+                          ],
+                          total=[{"$count": "n"}]
+                      )
+                      .execute())
+        results = docs[0]["rows"]
+        total = docs[0]["total"][0]["n"] if docs[0]["total"] else 0
         
         return {
             "results": results,
@@ -295,7 +337,7 @@ def create_advanced_api():
                 "page": page,
                 "per_page": per_page,
                 "total": total,
-                "pages": (total + per_page - 1) // per_page
+                "pages": -(-total // per_page)
             },
             "query": query,
             "sort": {"by": sort_by, "order": sort_order}
@@ -12,8 +12,17 @@ What you'll learn:
 - Handle large datasets efficiently
 """
 
-import asyncio
-from gdmongolite import DB, Schema, Email, FieldTypes, DataImporter, DataExporter
+import io
+import sys
+from pathlib import Path
+from gdmongolite import DB, Schema, Email, FieldTypes, DataImporter, DataExporter, run
+
+# Directories used by the demo, created once at import
+EXPORTS_DIR = Path("exports")
+IMPORTS_DIR = Path("imports")
+SAMPLE_DIR = Path("sample_data")
+for directory in (EXPORTS_DIR, IMPORTS_DIR, SAMPLE_DIR):
+    directory.mkdir(parents=True, exist_ok=True)
 
 # Step 1: Define your models
 db = DB()
@@ -40,260 +49,265 @@ db.register_schema(Product)
 async def demo_import_export():
     """Comprehensive import/export demonstration"""
     
-    print("📊 DATA IMPORT/EXPORT DEMO")
-    print("=" * 40)
-    
-    # Create sample data first
-    sample_customers = [
-        {
-            "name": "John Smith",
-            "email": "john@example.com",
-            "age": 32,
-            "country": "USA",
-            "purchase_amount": 299.99,
-            "join_date": "2023-01-15"
-        },
-        {
-            "name": "Maria Garcia",
-            "email": "maria@example.com", 
-            "age": 28,
-            "country": "Spain",
-            "purchase_amount": 450.50,
-            "join_date": "2023-02-20"
-        },
-        {
-            "name": "Yuki Tanaka",
-            "email": "yuki@example.com",
-            "age": 35,
-            "country": "Japan", 
-            "purchase_amount": 199.99,
-            "join_date": "2023-03-10"
-        }
-    ]
-    
-    # Save sample data
-    await db.Customer.insert(sample_customers)
-    print("✅ Created sample customer data")
-    
-    # Initialize importer and exporter
-    importer = DataImporter(db)
-    exporter = DataExporter(db)
-    
-    # EXPORT EXAMPLES
-    print("\n📤 EXPORTING DATA...")
-    
-    # Export to JSON
-    response = await exporter.export_to_file(
-        Customer,
-        "exports/customers.json",
-        format="json"
-    )
-    if response.success:
-        print(f"✅ Exported to JSON: {response.message}")
-    
-    # Export to CSV
-    response = await exporter.export_to_file(
-        Customer,
-        "exports/customers.csv",
-        format="csv"
-    )
-    if response.success:
-        print(f"✅ Exported to CSV: {response.message}")
-    
-    # Export to YAML
-    response = await exporter.export_to_file(
-        Customer,
-        "exports/customers.yaml",
-        format="yaml"
-    )
-    if response.success:
-        print(f"✅ Exported to YAML: {response.message}")
-    
-    # Export with filters (only USA customers)
-    response = await exporter.export_to_file(
-        Customer,
-        "exports/usa_customers.json",
-        query={"country": "USA"},
-        format="json"
-    )
-    if response.success:
-        print(f"✅ Exported USA customers only: {response.message}")
-    
-    # Export specific fields only
-    response = await exporter.export_to_file(
-        Customer,
-        "exports/customer_contacts.csv",
-        projection={"name": 1, "email": 1, "country": 1},
-        format="csv"
-    )
-    if response.success:
-        print(f"✅ Exported contacts only: {response.message}")
-    
-    # IMPORT EXAMPLES
-    print("\n📥 IMPORTING DATA...")
-    
-    # Clear existing data for clean import demo
-    await db.Product.delete()
-    
-    # Create sample import files
-    import json
-    import csv
-    from pathlib import Path
-    
-    # Create imports directory
-    Path("imports").mkdir(exist_ok=True)
-    
-    # Create JSON import file
-    products_json = [
-        {
-            "name": "Laptop Pro",
-            "category": "Electronics",
-            "price": 1299.99,
-            "rating": 4.5,
-            "description": "High-performance laptop for professionals"
-        },
-        {
-            "name": "Wireless Headphones",
-            "category": "Electronics", 
-            "price": 199.99,
-            "rating": 4.2,
-            "description": "Premium wireless headphones with noise cancellation"
-        },
-        {
-            "name": "Coffee Maker",
-            "category": "Home",
-            "price": 89.99,
-            "rating": 4.0,
-            "description": "Automatic drip coffee maker"
-        }
-    ]
-    
-    with open("imports/products.json", "w") as f:
-        json.dump(products_json, f, indent=2)
-    
-    # Import from JSON
-    response = await importer.import_from_file(
-        "imports/products.json",
-        Product,
-        format="json",
-        validate=True
-    )
-    if response.success:
-        print(f"✅ Imported from JSON: {response.message}")
-    
-    # Create CSV import file
-    csv_data = [
-        ["name", "category", "price", "rating", "description"],
-        ["Gaming Mouse", "Electronics", "79.99", "4.3", "High-precision gaming mouse"],
-        ["Desk Chair", "Furniture", "249.99", "4.1", "Ergonomic office chair"],
-        ["Water Bottle", "Sports", "24.99", "4.4", "Insulated stainless steel bottle"]
-    ]
-    
-    with open("imports/more_products.csv", "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerows(csv_data)
-    
-    # Import from CSV
-    response = await importer.import_from_file(
-        "imports/more_products.csv",
-        Product,
-        format="csv",
-        batch_size=100
-    )
-    if response.success:
-        print(f"✅ Imported from CSV: {response.message}")
-    
-    # ADVANCED IMPORT/EXPORT
-    print("\n🚀 ADVANCED FEATURES...")
+    # Collect the demo's output and write it in one go at the end
+    out = io.StringIO()
     
-    # Import with data transformation
-    def transform_product(data):
-        """Transform data during import"""
-        # Convert price to float if it's string
-        if isinstance(data.get("price"), str):
-            data["price"] = float(data["price"])
+    try:
+        print("📊 DATA IMPORT/EXPORT DEMO", file=out)
+        print("=" * 40, file=out)
         
-        # Add discount field
-        data["discount"] = 0.1 if data["price"] > 100 else 0.05
+        # Create sample data first
+        sample_customers = [
+            {
+                "name": "John Smith",
+                "email": "john@example.com",
+                "age": 32,
+                "country": "USA",
+                "purchase_amount": 299.99,
+                "join_date": "2023-01-15"
+            },
+            {
+                "name": "Maria Garcia",
+                "email": "maria@example.com", 
+                "age": 28,
+                "country": "Spain",
+                "purchase_amount": 450.50,
+                "join_date": "2023-02-20"
+            },
+            {
+                "name": "Yuki Tanaka",
+                "email": "yuki@example.com",
+                "age": 35,
+                "country": "Japan", 
+                "purchase_amount": 199.99,
+                "join_date": "2023-03-10"
+            }
+        ]
         
-        return data
-    
-    # Batch import with validation
-    response = await importer.import_from_file(
-        "imports/products.json",
-        Product,
-        batch_size=50,
-        validate=True
-    )
-    
-    # Export with sorting and limits
-    response = await exporter.export_to_file(
-        Product,
-        "exports/top_products.json",
-        sort={"rating": -1},  # Highest rated first
-        limit=5,  # Top 5 only
-        format="json"
-    )
-    if response.success:
-        print(f"✅ Exported top 5 products: {response.message}")
-    
-    # WORKING WITH EXTERNAL APIs
-    print("\n🌐 EXTERNAL API INTEGRATION...")
-    
-    # Import from external API (example)
-    try:
-        # This would import from a real API
-        # response = await importer.import_from_url(
-        #     "https://api.example.com/products",
-        #     Product,
-        #     format="json"
+        # Save sample data
+        await db.Customer.insert(sample_customers)
+        print("✅ Created sample customer data", file=out)
+        
+        # Initialize importer and exporter
+        importer = DataImporter(db)
+        exporter = DataExporter(db)
+        
+        # EXPORT EXAMPLES
+        print("\n📤 EXPORTING DATA...", file=out)
+        
+        # Export to JSON
+        response = await exporter.export_to_file(
+            Customer,
+            EXPORTS_DIR / "customers.json",
+            format="json"
+        )
+        if response.success:
+            print(f"✅ Exported to JSON: {response.message}", file=out)
+        
+        # Export to CSV
+        response = await exporter.export_to_file(
+            Customer,
+            EXPORTS_DIR / "customers.csv",
+            format="csv"
+        )
+        if response.success:
+            print(f"✅ Exported to CSV: {response.message}", file=out)
+        
+        # Export to YAML
+        response = await exporter.export_to_file(
+            Customer,
+            EXPORTS_DIR / "customers.yaml",
+            format="yaml"
+        )
+        if response.success:
+            print(f"✅ Exported to YAML: {response.message}", file=out)
+        
+        # Export with filters (only USA customers)
+        response = await exporter.export_to_file(
+            Customer,
+            EXPORTS_DIR / "usa_customers.json",
+            query={"country": "USA"},
+            format="json"
+        )
+        if response.success:
+            print(f"✅ Exported USA customers only: {response.message}", file=out)
+        
+        # Export specific fields only
+        response = await exporter.export_to_file(
+            Customer,
+            EXPORTS_DIR / "customer_contacts.csv",
+            projection={"name": 1, "email": 1, "country": 1},
+            format="csv"
+        )
+        if response.success:
+            print(f"✅ Exported contacts only: {response.message}", file=out)
+        
+        # IMPORT EXAMPLES
+        print("\n📥 IMPORTING DATA...", file=out)
+        
+        # Create sample import files
+        import json
+        import csv
+        
+        # Create JSON import file
+        products_json = [
+            {
+                "name": "Laptop Pro",
+                "category": "Electronics",
+                "price": 1299.99,
+                "rating": 4.5,
+                "description": "High-performance laptop for professionals"
+            },
+            {
+                "name": "Wireless Headphones",
+                "category": "Electronics", 
+                "price": 199.99,
+                "rating": 4.2,
+                "description": "Premium wireless headphones with noise cancellation"
+            },
+            {
+                "name": "Coffee Maker",
+                "category": "Home",
+                "price": 89.99,
+                "rating": 4.0,
+                "description": "Automatic drip coffee maker"
+            }
+        ]
+        
+        with open(IMPORTS_DIR / "products.json", "w") as f:
+            json.dump(products_json, f, indent=2)
+        
+        # Import from JSON
+        response = await importer.import_from_file(
+            IMPORTS_DIR / "products.json",
+            Product,
+            format="json",
+            validate=True,
+            mode="upsert",  # re-running the demo won't duplicate products
+            key_fields=("name",)
+        )
+        if response.success:
+            print(f"✅ Imported from JSON: {response.message}", file=out)
+        
+        # Create CSV import file
+        csv_data = [
+            ["name", "category", "price", "rating", "description"],
+            ["Gaming Mouse", "Electronics", "79.99", "4.3", "High-precision gaming mouse"],
+            ["Desk Chair", "Furniture", "249.99", "4.1", "Ergonomic office chair"],
+            ["Water Bottle", "Sports", "24.99", "4.4", "Insulated stainless steel bottle"]
+        ]
+        
+        with open(IMPORTS_DIR / "more_products.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerows(csv_data)
+        
+        # Import from CSV
+        response = await importer.import_from_file(
+            IMPORTS_DIR / "more_products.csv",
+            Product,
+            format="csv",
+            batch_size=10_000,
+            mode="upsert",
+            key_fields=("name",)
+        )
+        if response.success:
+            print(f"✅ Imported from CSV: {response.message}", file=out)
+        
+        # ADVANCED IMPORT/EXPORT
+        print("\n🚀 ADVANCED FEATURES...", file=out)
+        
+        # Import with data transformation
+        def transform_product(data):
+            """Transform data during import"""
+            # Convert price to float if it's string
+            if isinstance(data.get("price"), str):
+                data["price"] = float(data["price"])
+            
+            # Add discount field
+            data["discount"] = 0.1 if data["price"] > 100 else 0.05
+            
+            return data
+        
+        # Batch import with validation
+        response = await importer.import_from_file(
+            IMPORTS_DIR / "products.json",
+            Product,
+            batch_size=10_000,
+            validate=True,
+            mode="upsert",
+            key_fields=("name",)
+        )
+        
+        # Export with sorting and limits
+        response = await exporter.export_to_file(
+            Product,
+            EXPORTS_DIR / "top_products.json",
+            sort={"rating": -1},  # Highest rated first
+            limit=5,  # Top 5 only
+            format="json"
+        )
+        if response.success:
+            print(f"✅ Exported top 5 products: {response.message}", file=out)
+        
+        # WORKING WITH EXTERNAL APIs
+        print("\n🌐 EXTERNAL API INTEGRATION...", file=out)
+        
+        # Import from external API (example)
+        try:
+            # This would import from a real API
+            # response = await importer.import_from_url(
+            #     "https://api.example.com/products",
+            #     Product,
+            #     format="json"
+            # )
+            print("💡 API import ready - just provide the URL!", file=out)
+        except Exception as e:
+            print(f"ℹ️  API import example (would work with real API)", file=out)
+        
+        # MIGRATION BETWEEN DATABASES
+        print("\n🔄 DATABASE MIGRATION...", file=out)
+        
+        from gdmongolite import DataMigrator
+        
+        # Create second database for migration demo
+        target_db = DB("mongodb://localhost:27017", "target_database")
+        target_db.register_schema(Customer)
+        
+        migrator = DataMigrator(db, target_db)
+        
+        # Migrate customers to new database. Both DBs share one client, so the
+        # copy runs server-side with $merge; transform_fields are $addFields
+        # expressions (use transform_func for arbitrary Python transforms).
+        # response = await migrator.migrate_collection(
+        #     Customer,
+        #     transform_fields={"migrated": True}
         # )
-        print("💡 API import ready - just provide the URL!")
-    except Exception as e:
-        print(f"ℹ️  API import example (would work with real API)")
-    
-    # MIGRATION BETWEEN DATABASES
-    print("\n🔄 DATABASE MIGRATION...")
-    
-    from gdmongolite import DataMigrator
-    
-    # Create second database for migration demo
-    target_db = DB("mongodb://localhost:27017", "target_database")
-    target_db.register_schema(Customer)
-    
-    migrator = DataMigrator(db, target_db)
-    
-    # Migrate customers to new database
-    # response = await migrator.migrate_collection(
-    #     Customer,
-    #     transform_func=lambda doc: {**doc, "migrated": True}
-    # )
-    print("💡 Migration ready - can move data between databases!")
-    
-    # PERFORMANCE MONITORING
-    print("\n📈 PERFORMANCE STATS...")
-    
-    # Check how many products we have
-    total_products = await db.Product.find().count()
-    print(f"📊 Total products imported: {total_products}")
-    
-    # Show file sizes
-    import os
-    for file_path in ["exports/customers.json", "exports/customers.csv"]:
-        if os.path.exists(file_path):
-            size = os.path.getsize(file_path)
-            print(f"📁 {file_path}: {size} bytes")
+        print("💡 Migration ready - can move data between databases!", file=out)
+        
+        # PERFORMANCE MONITORING
+        print("\n📈 PERFORMANCE STATS...", file=out)
+        
+        # Check how many products we have
+        total_products = await db.Product.find().count()
+        print(f"📊 Total products imported: {total_products}", file=out)
+        
+        # Show file sizes (one directory scan instead of a stat per file)
+        import os
+        with os.scandir(EXPORTS_DIR) as entries:
+            sizes = {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+        for name in ["customers.json", "customers.csv"]:
+            if name in sizes:
+                print(f"📁 exports/{name}: {sizes[name]} bytes", file=out)
+    finally:
+        # Write even if a step fails, so the output so far is not lost
+        sys.stdout.write(out.getvalue())
 
 async def create_sample_files():
     """Create sample files for import demonstration"""
-    from pathlib import Path
     import json
     import csv
     import yaml
     
-    # Create directories
-    Path("sample_data").mkdir(exist_ok=True)
-    
     # Sample customer data
     customers = [
         {
@@ -323,32 +337,34 @@ async def create_sample_files():
     ]
     
     # Create JSON file
-    with open("sample_data/customers.json", "w") as f:
+    with open(SAMPLE_DIR / "customers.json", "w") as f:
         json.dump(customers, f, indent=2)
     
     # Create CSV file
-    with open("sample_data/customers.csv", "w", newline="") as f:
+    with open(SAMPLE_DIR / "customers.csv", "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=customers[0].keys())
         writer.writeheader()
         writer.writerows(customers)
     
     # Create YAML file
-    with open("sample_data/customers.yaml", "w") as f:
-        yaml.dump(customers, f, default_flow_style=False)
+    with open(SAMPLE_DIR / "customers.yaml", "w") as f:
+        yaml.dump(customers, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), default_flow_style=False)
     
     print("✅ Created sample data files:")
     print("  - sample_data/customers.json")
     print("  - sample_data/customers.csv") 
     print("  - sample_data/customers.yaml")
 
+async def _main():
+    # Create sample files first, then run the main demo on the same loop
+    await create_sample_files()
+    await demo_import_export()
+
 if __name__ == "__main__":
     print("🚀 Starting Data Import/Export Demo...")
     
-    # Create sample files first
-    asyncio.run(create_sample_files())
-    
-    # Run the main demo
-    asyncio.run(demo_import_export())
+    # One event loop (uvloop when installed) and one shared client for both phases
+    run(_main())
     
     print("\n🎉 DEMO COMPLETE!")
     print("\n📚 What you learned:")
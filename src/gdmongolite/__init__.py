@@ -7,7 +7,7 @@ __email__ = "ganeshdattapadamata@gmail.com"
 import os
 
 # Core functionality
-from .core import DB, Schema, QueryResponse
+from .core import DB, Schema, QueryResponse, run
 from .types import Email, Positive, ObjectId, DateTime, FieldTypes
 from .exceptions import GDMongoError, ValidationError, ConnectionError
 
@@ -169,7 +169,7 @@ DB = PowerDB
 # Everything you need in one import
 __all__ = [
     # Core functionality
-    "DB", "Schema", "QueryResponse",
+    "DB", "Schema", "QueryResponse", "run",
     "Email", "Positive", "ObjectId", "DateTime", "FieldTypes",
     "GDMongoError", "ValidationError", "ConnectionError",
     "QueryBuilder", "Cursor", "AggregationPipeline",
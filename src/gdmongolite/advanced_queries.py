@@ -150,7 +150,7 @@ class AggregationBuilder:
     def match(self, **filters) -> 'AggregationBuilder':
         """Filter documents"""
         from .query import QueryBuilder
-        query = QueryBuilder.build_filter(filters)
+        query = QueryBuilder.build_filter(filters, self.schema)
         self.pipeline.append({"$match": query})
         return self
     
@@ -3,18 +3,25 @@
 import os
 import asyncio
 import inspect
+import weakref
 from typing import Dict, List, Any, Optional, Union, Type
 from datetime import datetime
 from contextlib import asynccontextmanager
 
 import motor.motor_asyncio
 import pymongo
+from pymongo import IndexModel
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
-from pydantic import BaseModel, ValidationError as PydanticValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError as PydanticValidationError
 try:
     from bson import ObjectId
 except ImportError:
     from pymongo.objectid import ObjectId
+try:
+    import uvloop
+except ImportError:  # optional - falls back to the default event loop
+    uvloop = None
 
 from .exceptions import GDMongoError, ValidationError, ConnectionError, QueryError
 from .query import QueryBuilder, Cursor
@@ -22,6 +29,30 @@ from .query import QueryBuilder, Cursor
 # Load environment variables
 load_dotenv()
 
+def run(coro, *, client_uri: str = None):
+    """Run a coroutine as a script entrypoint, like ``asyncio.run``
+    
+    Uses uvloop when installed. The client for ``client_uri`` (defaults to
+    MONGO_URI) is created before the coroutine starts, so every DB on that
+    URI shares it from the first query. Clients opened during the run are
+    closed when it ends.
+    
+    Example:
+        from gdmongolite import run
+        run(main())
+    """
+    async def _main():
+        DB(client_uri, mode="async")._get_db()
+        try:
+            return await coro
+        finally:
+            for client, _ in DB._async_clients.pop(asyncio.get_running_loop(), {}).values():
+                client.close()
+    
+    if uvloop is not None:
+        return uvloop.run(_main())
+    return asyncio.run(_main())
+
 class QueryResponse:
     """Standardized response for all database operations"""
     
@@ -52,12 +83,19 @@ class DB:
     """The main DB facade - automatically detects sync/async context"""
     
     _instances = {}
+    
+    # Clients shared by every DB on the same URI, stored as [client, refs]
+    # and closed when the last DB using them closes. Motor clients are bound
+    # to the event loop they first run on, so async clients are kept per loop.
+    _async_clients = weakref.WeakKeyDictionary()  # loop -> {uri: [client, refs]}
+    _sync_clients: Dict[str, list] = {}
     _default_config = {
         "uri": os.getenv("MONGO_URI", "mongodb://localhost:27017"),
         "database": os.getenv("MONGO_DB", "gdmongo"),
         "max_pool_size": int(os.getenv("MONGO_MAX_POOL", "50")),
         "min_pool_size": int(os.getenv("MONGO_MIN_POOL", "5")),
-        "timeout_ms": int(os.getenv("MONGO_TIMEOUT_MS", "30000"))
+        "timeout_ms": int(os.getenv("MONGO_TIMEOUT_MS", "30000")),
+        "auto_index": os.getenv("GDMONGO_AUTO_INDEX", "false").lower() == "true"
     }
     
     def __init__(self, uri: str = None, database: str = None, mode: str = "auto"):
@@ -78,31 +116,56 @@ class DB:
         self._async_db = None
         self._sync_db = None
         
+        # (registry, entry) of the shared client this DB holds a reference to
+        self._async_lease = None
+        self._sync_lease = None
+        
         # Schema registry
         self._schemas: Dict[str, Type['Schema']] = {}
+        
+        # Create indexes for unindexed sorts instead of only warning about them
+        self.auto_index = self._default_config["auto_index"]
+        
+        # Collection name -> list of index key tuples, filled on first sort
+        self._index_cache: Dict[str, List[tuple]] = {}
     
     def _init_async(self):
-        """Initialize async MongoDB connection"""
+        """Initialize async MongoDB connection, reusing this URI's client"""
         try:
-            self._async_client = motor.motor_asyncio.AsyncIOMotorClient(
-                self.uri,
-                maxPoolSize=self._default_config["max_pool_size"],
-                minPoolSize=self._default_config["min_pool_size"],
-                serverSelectionTimeoutMS=self._default_config["timeout_ms"]
-            )
+            try:
+                clients = DB._async_clients.setdefault(asyncio.get_running_loop(), {})
+            except RuntimeError:
+                clients = {}  # No running loop yet - don't share a client
+            
+            entry = clients.get(self.uri)
+            if entry is None:
+                entry = clients[self.uri] = [motor.motor_asyncio.AsyncIOMotorClient(
+                    self.uri,
+                    maxPoolSize=self._default_config["max_pool_size"],
+                    minPoolSize=self._default_config["min_pool_size"],
+                    serverSelectionTimeoutMS=self._default_config["timeout_ms"]
+                ), 0]
+            entry[1] += 1
+            self._async_lease = (clients, entry)
+            self._async_client = entry[0]
             self._async_db = self._async_client[self.database_name]
         except Exception as e:
             raise ConnectionError(f"Failed to connect to MongoDB (async): {e}")
     
     def _init_sync(self):
-        """Initialize sync MongoDB connection"""
+        """Initialize sync MongoDB connection, reusing this URI's client"""
         try:
-            self._sync_client = pymongo.MongoClient(
-                self.uri,
-                maxPoolSize=self._default_config["max_pool_size"],
-                minPoolSize=self._default_config["min_pool_size"],
-                serverSelectionTimeoutMS=self._default_config["timeout_ms"]
-            )
+            entry = DB._sync_clients.get(self.uri)
+            if entry is None:
+                entry = DB._sync_clients[self.uri] = [pymongo.MongoClient(
+                    self.uri,
+                    maxPoolSize=self._default_config["max_pool_size"],
+                    minPoolSize=self._default_config["min_pool_size"],
+                    serverSelectionTimeoutMS=self._default_config["timeout_ms"]
+                ), 0]
+            entry[1] += 1
+            self._sync_lease = (DB._sync_clients, entry)
+            self._sync_client = entry[0]
             self._sync_db = self._sync_client[self.database_name]
         except Exception as e:
             raise ConnectionError(f"Failed to connect to MongoDB (sync): {e}")
@@ -146,15 +209,64 @@ class DB:
         self._schemas[schema_class.__name__] = schema_class
         schema_class._db = self
     
+    def register_schemas(self, *schema_classes: Type['Schema']):
+        """Register several schema classes at once
+        
+        Example:
+            db.register_schemas(User, Product, Order)
+            await db.ensure_indexes()
+        """
+        for schema_class in schema_classes:
+            self.register_schema(schema_class)
+    
+    async def ensure_indexes(self, *schema_classes: Type['Schema']) -> Dict[str, List[str]]:
+        """Create the indexes declared in each schema's ``Config.indexes``
+        
+        Every collection gets a single createIndexes command, and all of them
+        are sent concurrently. Defaults to every registered schema. Existing
+        indexes are left untouched, so this is safe to call on every startup.
+        """
+        schemas = schema_classes or tuple(self._schemas.values())
+        pending = [
+            (schema, [IndexModel(list(spec.items())) for spec in schema.model_config.get('indexes', [])])
+            for schema in schemas
+        ]
+        pending = [(schema, models) for schema, models in pending if models]
+        
+        results = await asyncio.gather(*(
+            schema._get_collection("async").create_indexes(models)
+            for schema, models in pending
+        ))
+        for schema, _ in pending:
+            schema._forget_indexes()
+        return {schema._collection_name: names for (schema, _), names in zip(pending, results)}
+    
+    def _release(self, lease):
+        """Drop this DB's reference to a shared client, closing it if last"""
+        clients, entry = lease
+        entry[1] -= 1
+        if entry[1] <= 0:
+            if clients.get(self.uri) is entry:
+                del clients[self.uri]
+            entry[0].close()
+    
     async def close(self):
-        """Close async connections"""
-        if self._async_client is not None:
-            self._async_client.close()
+        """Close async connections
+        
+        The client is shared with other DBs on the same URI and is only
+        closed once the last of them closes.
+        """
+        if self._async_lease is not None:
+            self._release(self._async_lease)
+            self._async_lease = None
+            self._async_client = self._async_db = None
     
     def close_sync(self):
-        """Close sync connections"""
-        if self._sync_client is not None:
-            self._sync_client.close()
+        """Close sync connections (closed once the last DB on the URI closes)"""
+        if self._sync_lease is not None:
+            self._release(self._sync_lease)
+            self._sync_lease = None
+            self._sync_client = self._sync_db = None
 
 class Schema(BaseModel):
     """Base schema class with automatic CRUD operations"""
@@ -176,6 +288,19 @@ class Schema(BaseModel):
         else:
             cls._collection_name = 'documents'
     
+    @classmethod
+    def _list_adapter(cls) -> TypeAdapter:
+        """TypeAdapter validating a list of documents, built once per schema
+        
+        Stored on the class itself, so dynamically created schemas release it
+        together with the class.
+        """
+        adapter = cls.__dict__.get('__list_adapter__')
+        if adapter is None:
+            adapter = TypeAdapter(List[cls])
+            cls.__list_adapter__ = adapter
+        return adapter
+    
     @staticmethod
     def _to_snake_case(name: str) -> str:
         """Convert CamelCase to snake_case"""
@@ -200,10 +325,29 @@ class Schema(BaseModel):
         """Create standardized response"""
         return QueryResponse(success, data, count, message, error, duration)
     
+    @staticmethod
+    def _written_ids(chunk: List[Dict], error: BaseException, ordered: bool) -> List[Any]:
+        """Ids from a failed insert_many chunk that were written anyway"""
+        if not isinstance(error, BulkWriteError):
+            return []
+        # insert_many sets _id on each document before sending
+        failed = {e['index'] for e in error.details.get('writeErrors', [])}
+        if ordered:
+            chunk = chunk[:min(failed, default=0)]
+        return [doc['_id'] for j, doc in enumerate(chunk) if j not in failed]
+    
     # ASYNC CRUD OPERATIONS
     @classmethod
-    async def insert(cls, data: Union[Dict, List[Dict], 'Schema', List['Schema']]) -> QueryResponse:
-        """Insert one or many documents"""
+    async def insert(cls, data: Union[Dict, List[Dict], 'Schema', List['Schema']],
+                     chunk_size: int = 1000, ordered: bool = False) -> QueryResponse:
+        """Insert one or many documents
+        
+        Lists are split into chunks of ``chunk_size`` documents. With
+        ``ordered=False`` the chunks are sent concurrently and one bad
+        document does not abort the rest; with ``ordered=True`` they are sent
+        one after another and the insert stops at the first error. Either
+        way the response reports the ids that were inserted.
+        """
         start_time = datetime.now()
         
         try:
@@ -211,26 +355,41 @@ class Schema(BaseModel):
             
             # Handle different input types
             if isinstance(data, (list, tuple)):
-                # Multiple documents
-                docs = []
-                for item in data:
-                    if isinstance(item, cls):
-                        docs.append(item.dict())
-                    elif isinstance(item, dict):
-                        # Validate with Pydantic
-                        validated = cls(**item)
-                        docs.append(validated.dict())
-                    else:
-                        raise ValidationError(f"Invalid data type: {type(item)}")
+                # Multiple documents, validated with Pydantic in one call
+                docs = [item.dict() for item in cls._list_adapter().validate_python(list(data))]
+                
+                chunks = [docs[i:i + chunk_size] for i in range(0, len(docs), chunk_size)]
+                
+                if ordered:
+                    results = []
+                    for chunk in chunks:
+                        try:
+                            results.append(await collection.insert_many(chunk, ordered=True))
+                        except Exception as e:
+                            results.append(e)
+                            break
+                else:
+                    results = await asyncio.gather(*(
+                        collection.insert_many(chunk, ordered=False) for chunk in chunks
+                    ), return_exceptions=True)
+                
+                inserted_ids = []
+                errors = []
+                for chunk, result in zip(chunks, results):
+                    if not isinstance(result, BaseException):
+                        inserted_ids.extend(result.inserted_ids)
+                        continue
+                    errors.append(str(result))
+                    inserted_ids.extend(cls._written_ids(chunk, result, ordered))
                 
-                result = await collection.insert_many(docs)
                 duration = (datetime.now() - start_time).total_seconds() * 1000
                 
                 return cls._create_response(
-                    success=True,
-                    data=result.inserted_ids,
-                    count=len(result.inserted_ids),
-                    message=f"Inserted {len(result.inserted_ids)} documents",
+                    success=not errors,
+                    data=inserted_ids,
+                    count=len(inserted_ids),
+                    message=f"Inserted {len(inserted_ids)} documents",
+                    error="; ".join(errors) or None,
                     duration=duration
                 )
             else:
@@ -268,6 +427,34 @@ class Schema(BaseModel):
         """Find documents with advanced filtering"""
         return Cursor(cls, filters)
     
+    @classmethod
+    def _index_keys(cls, keys: Union[str, List]) -> List:
+        """Normalize index keys: 'field', '-field' or [(field, direction), ...]"""
+        if isinstance(keys, str):
+            return [(keys[1:], -1)] if keys.startswith('-') else [(keys, 1)]
+        return list(keys)
+    
+    @classmethod
+    def _forget_indexes(cls):
+        """Drop the cached index list used by the sort-index check"""
+        index_cache = getattr(cls._db, '_index_cache', None)  # None until registered
+        if index_cache is not None:
+            index_cache.pop(cls._collection_name, None)
+    
+    @classmethod
+    async def create_index(cls, keys: Union[str, List], **kwargs) -> str:
+        """Create an index on this collection (no-op if it already exists)
+        
+        Examples:
+            await User.create_index('email', unique=True)
+            await Post.create_index('tags')  # multikey index for list fields
+            await Post.create_index([('author_email', 1), ('created_at', -1)])
+        """
+        collection = cls._get_collection("async")
+        name = await collection.create_index(cls._index_keys(keys), **kwargs)
+        cls._forget_indexes()
+        return name
+    
     @classmethod
     async def update(cls, filter_dict: Dict, update_dict: Dict, upsert: bool = False) -> QueryResponse:
         """Update documents"""
@@ -311,7 +498,7 @@ class Schema(BaseModel):
         
         try:
             collection = cls._get_collection("async")
-            query = QueryBuilder.build_filter(filters)
+            query = QueryBuilder.build_filter(filters, cls)
             
             result = await collection.delete_many(query)
             duration = (datetime.now() - start_time).total_seconds() * 1000
@@ -335,7 +522,8 @@ class Schema(BaseModel):
     
     # SYNC CRUD OPERATIONS
     @classmethod
-    def insert_sync(cls, data: Union[Dict, List[Dict], 'Schema', List['Schema']]) -> QueryResponse:
+    def insert_sync(cls, data: Union[Dict, List[Dict], 'Schema', List['Schema']],
+                    chunk_size: int = 1000, ordered: bool = False) -> QueryResponse:
         """Sync version of insert"""
         start_time = datetime.now()
         
@@ -343,24 +531,29 @@ class Schema(BaseModel):
             collection = cls._get_collection("sync")
             
             if isinstance(data, (list, tuple)):
-                docs = []
-                for item in data:
-                    if isinstance(item, cls):
-                        docs.append(item.dict())
-                    elif isinstance(item, dict):
-                        validated = cls(**item)
-                        docs.append(validated.dict())
-                    else:
-                        raise ValidationError(f"Invalid data type: {type(item)}")
+                docs = [item.dict() for item in cls._list_adapter().validate_python(list(data))]
                 
-                result = collection.insert_many(docs)
+                inserted_ids = []
+                errors = []
+                for i in range(0, len(docs), chunk_size):
+                    chunk = docs[i:i + chunk_size]
+                    try:
+                        result = collection.insert_many(chunk, ordered=ordered)
+                    except Exception as e:
+                        errors.append(str(e))
+                        inserted_ids.extend(cls._written_ids(chunk, e, ordered))
+                        if ordered:
+                            break
+                        continue
+                    inserted_ids.extend(result.inserted_ids)
                 duration = (datetime.now() - start_time).total_seconds() * 1000
                 
                 return cls._create_response(
-                    success=True,
-                    data=result.inserted_ids,
-                    count=len(result.inserted_ids),
-                    message=f"Inserted {len(result.inserted_ids)} documents",
+                    success=not errors,
+                    data=inserted_ids,
+                    count=len(inserted_ids),
+                    message=f"Inserted {len(inserted_ids)} documents",
+                    error="; ".join(errors) or None,
                     duration=duration
                 )
             else:
@@ -392,6 +585,14 @@ class Schema(BaseModel):
                 duration=duration
             )
     
+    @classmethod
+    def create_index_sync(cls, keys: Union[str, List], **kwargs) -> str:
+        """Sync version of create_index"""
+        collection = cls._get_collection("sync")
+        name = collection.create_index(cls._index_keys(keys), **kwargs)
+        cls._forget_indexes()
+        return name
+    
     @classmethod
     def update_sync(cls, filter_dict: Dict, update_dict: Dict, upsert: bool = False) -> QueryResponse:
         """Sync version of update"""
@@ -434,7 +635,7 @@ class Schema(BaseModel):
         
         try:
             collection = cls._get_collection("sync")
-            query = QueryBuilder.build_filter(filters)
+            query = QueryBuilder.build_filter(filters, cls)
             
             result = collection.delete_many(query)
             duration = (datetime.now() - start_time).total_seconds() * 1000
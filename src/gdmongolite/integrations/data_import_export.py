@@ -1,19 +1,167 @@
 """Data import/export functionality for gdmongolite"""
 
+import io
+import os
+import logging
 import json
 import csv
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Optional, Union, Type, IO
+from typing import (
+    Dict, List, Any, Optional, Union, Type, IO, Iterable, Iterator, Sequence, Callable, Tuple,
+    get_args, get_origin
+)
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from itertools import islice
 import asyncio
 
+try:
+    import orjson
+except ImportError:  # optional - JSON export falls back to the json module
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional - CSV import falls back to the csv module
+    pa = None
+
+from bson import Int64
+from pymongo import UpdateOne, WriteConcern
+from pymongo.errors import BulkWriteError
+from pydantic import ValidationError as PydanticValidationError
+
 from ..core import DB, Schema, QueryResponse
 from ..exceptions import GDMongoError
 from ..utils import serialize_for_mongo, format_file_size
 
 
+logger = logging.getLogger(__name__)
+
+
+# Documents per insert_many during imports
+DEFAULT_IMPORT_BATCH_SIZE = 10_000
+
+# Cursor batch size and write buffer for streamed JSON exports
+EXPORT_BATCH_SIZE = 5000
+EXPORT_WRITE_BUFFER = 4 * 1024 * 1024
+
+# Export files at least this big get their disk space reserved up front
+PREALLOCATE_THRESHOLD = 16 * 1024 * 1024
+
+# JSON files above this size are parsed incrementally (needs ijson)
+JSON_STREAM_THRESHOLD = 16 * 1024 * 1024
+
+
+def _sequential(f: IO) -> IO:
+    """Hint the kernel that a file will be read front to back (bigger readahead)"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+
+def _write_all(file_path: Path, payload: bytes):
+    """Write a whole payload to a file (run via asyncio.to_thread)"""
+    with open(file_path, 'wb', buffering=1 << 20) as f:
+        # Reserve the blocks up front for big files so the filesystem can
+        # lay them out contiguously instead of growing the file per write
+        if len(payload) >= PREALLOCATE_THRESHOLD and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, len(payload))
+            except OSError:
+                pass
+        f.write(payload)
+
+
+def _json_default(value: Any) -> str:
+    """json.dumps fallback matching orjson's output with OPT_NAIVE_UTC
+    
+    Datetimes become ISO 8601 (naive ones as UTC), so exports look the same
+    whether or not orjson is installed; anything else becomes str().
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+class _ExportDumper(SafeDumper):
+    """Safe YAML dumper for BSON documents
+    
+    Int64 is written as a plain int; ObjectId, Decimal128, Binary, UUID and
+    any other type the safe dumper doesn't know are written as str().
+    """
+
+
+_ExportDumper.add_representer(Int64, lambda dumper, value: dumper.represent_int(int(value)))
+_ExportDumper.add_representer(None, lambda dumper, value: dumper.represent_str(str(value)))
+
+
+def _field_type(schema: Type[Schema], name: str) -> Any:
+    """Scalar annotation of a schema field, unwrapping Optional[...]"""
+    field = schema.model_fields.get(name)
+    annotation = field.annotation if field is not None else None
+    if get_origin(annotation) is Union:  # Optional[int] and friends
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _arrow_column_types(schema: Type[Schema], header: Tuple[str, ...]) -> Dict[str, Any]:
+    """Arrow column types for a CSV header (used by CSV import)
+    
+    Every column except the schema's int/float/bool fields is read as a
+    string, so Arrow never turns "007" into a number or "2023-01-15" into
+    a date. Those three are inferred; Arrow's strict parsers would reject
+    values Pydantic accepts, such as "3.0" for an int or "yes" for a bool.
+    """
+    return {
+        name: pa.string()
+        for name in header
+        if _field_type(schema, name) not in (int, float, bool)
+    }
+
+
+# Inline conversions for scalar schema fields, keyed by annotation. bool is
+# left to _convert_csv_value so "1"/"yes"/"on" reach Pydantic's coercion.
+_CSV_CASTS = {
+    int: "int({v}) if {v} else None",
+    float: "float({v}) if {v} else None",
+    str: "{v} if {v} else None",
+}
+
+
+@lru_cache(maxsize=None)
+def _csv_row_converter(schema: Type[Schema], header: Tuple[str, ...]) -> Callable[[List[str]], Dict]:
+    """Generate a function turning one csv.reader row into a document
+    
+    Columns the schema types as int/float/str are cast inline; all others
+    go through DataImporter._convert_csv_value.
+    """
+    items = []
+    for i, name in enumerate(header):
+        cast = _CSV_CASTS.get(_field_type(schema, name), "_convert({v})")
+        items.append(f"{name!r}: " + cast.format(v=f"r[{i}]"))
+    
+    source = "def _csv_row(r):\n    return {" + ", ".join(items) + "}\n"
+    namespace = {"_convert": DataImporter._convert_csv_value}
+    exec(source, namespace)
+    return namespace["_csv_row"]
+
+
 class DataImporter:
     """Import data from various formats into MongoDB"""
     
@@ -26,12 +174,33 @@ class DataImporter:
         file_path: Union[str, Path], 
         schema: Type[Schema],
         format: str = None,
-        batch_size: int = 1000,
+        batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
         validate: bool = True,
         upsert: bool = False,
-        upsert_key: str = None
+        upsert_key: str = None,
+        mode: str = "insert",
+        key_fields: Sequence[str] = None,
+        write_concern: WriteConcern = None
     ) -> QueryResponse:
-        """Import data from file"""
+        """Import data from file
+        
+        Each batch is written with one unordered insert_many, so a bad
+        document does not abort the rest of its batch. Batches are validated
+        and written one at a time: a batch that fails validation is skipped
+        and reported in ``errors`` while the other batches are still
+        imported, so a failed import can be partial (see ``count``).
+        
+        With ``mode="upsert"`` documents are matched on ``key_fields`` and
+        only inserted when no match exists ($setOnInsert), so re-running an
+        import is idempotent. ``upsert=True, upsert_key=...`` overwrites
+        matches ($set) instead. Both send one bulk_write per batch.
+        
+        Writes use the collection's write concern (from the client or URI)
+        unless ``write_concern`` is given. ``WriteConcern(w=1, j=False)``
+        speeds up bulk loads by not waiting for the journal;
+        ``WriteConcern(w=0)`` skips acknowledgements for non-critical
+        imports, and the server-side validator then always runs.
+        """
         
         file_path = Path(file_path)
         
@@ -45,15 +214,24 @@ class DataImporter:
         if format not in self.supported_formats:
             raise GDMongoError(f"Unsupported format: {format}")
         
-        print(f"📥 Importing from {file_path} ({format.upper()})...")
+        if mode not in ("insert", "upsert"):
+            raise GDMongoError(f"Unsupported import mode: {mode}")
+        
+        if upsert and upsert_key:
+            key_fields = (upsert_key,)
+        elif mode == "upsert" and not key_fields:
+            raise GDMongoError("mode='upsert' requires key_fields")
+        
+        logger.info("Importing from %s (%s)", file_path, format.upper())
         start_time = datetime.now()
+        total_imported = 0
         
         try:
-            # Read and parse data
+            # Read and parse data (JSON is streamed lazily when large)
             if format == 'json':
-                data = await self._read_json(file_path)
+                data = self._read_json(file_path)
             elif format == 'csv':
-                data = await self._read_csv(file_path)
+                data = self._read_csv(file_path, schema)
             elif format in ['yaml', 'yml']:
                 data = await self._read_yaml(file_path)
             elif format == 'xml':
@@ -61,38 +239,46 @@ class DataImporter:
             else:
                 raise GDMongoError(f"Format {format} not implemented yet")
             
-            # Validate data if requested
-            if validate:
-                data = await self._validate_data(data, schema)
-            
-            # Import in batches
-            total_imported = 0
+            # Import in batches, with the client's write concern by default
+            collection = schema._get_collection("async")
+            if write_concern is not None:
+                collection = collection.with_options(write_concern=write_concern)
+            # pymongo refuses bypass_document_validation on w=0 writes
+            bypass = {"bypass_document_validation": validate} if collection.write_concern.acknowledged else {}
             errors = []
             
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i + batch_size]
-                
+            for batch_number, batch in enumerate(self._batched(data, batch_size), 1):
                 try:
-                    if upsert and upsert_key:
-                        # Upsert each document individually
-                        for doc in batch:
-                            if upsert_key in doc:
-                                await schema.update(
-                                    {upsert_key: doc[upsert_key]},
-                                    doc,
-                                    upsert=True
-                                )
-                                total_imported += 1
+                    # Validate data if requested; a bad row skips its batch
+                    if validate:
+                        batch = await self._validate_data(batch, schema, start=(batch_number - 1) * batch_size)
+                    
+                    if key_fields and (mode == "upsert" or upsert):
+                        operator = "$set" if upsert else "$setOnInsert"
+                        ops = [
+                            UpdateOne({k: doc[k] for k in key_fields}, {operator: doc}, upsert=True)
+                            for doc in batch
+                            if all(k in doc for k in key_fields)
+                        ]
+                        if len(ops) < len(batch):
+                            errors.append(f"Batch {batch_number}: {len(batch) - len(ops)} documents missing key fields")
+                        if ops:
+                            result = await collection.bulk_write(ops, ordered=False)
+                            if result.acknowledged:
+                                total_imported += result.upserted_count + (result.matched_count if upsert else 0)
+                            else:
+                                total_imported += len(ops)  # w=0: sent, not confirmed
                     else:
-                        # Regular batch insert
-                        response = await schema.insert(batch)
-                        if response.success:
-                            total_imported += response.count
-                        else:
-                            errors.append(f"Batch {i//batch_size + 1}: {response.error}")
+                        # Regular batch insert; the server-side validator is
+                        # skipped only when the batch was validated above
+                        result = await collection.insert_many(batch, ordered=False, **bypass)
+                        total_imported += len(result.inserted_ids)
                 
+                except BulkWriteError as e:
+                    total_imported += e.details.get('nInserted', 0) + e.details.get('nUpserted', 0)
+                    errors.append(f"Batch {batch_number}: {len(e.details.get('writeErrors', []))} documents failed")
                 except Exception as e:
-                    errors.append(f"Batch {i//batch_size + 1}: {str(e)}")
+                    errors.append(f"Batch {batch_number}: {str(e)}")
             
             duration = (datetime.now() - start_time).total_seconds()
             
@@ -105,17 +291,47 @@ class DataImporter:
             )
         
         except Exception as e:
+            # Batches written before the failure stay imported
             duration = (datetime.now() - start_time).total_seconds()
             return QueryResponse(
                 success=False,
+                data={"imported": total_imported, "errors": [str(e)]},
+                count=total_imported,
                 error=str(e),
-                message="Import failed",
+                message=f"Import failed after {total_imported} documents",
                 duration=duration * 1000
             )
     
-    async def _read_json(self, file_path: Path) -> List[Dict]:
-        """Read JSON file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
+    @staticmethod
+    def _batched(rows: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+        """Group rows into lists of at most batch_size"""
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def _read_json(self, file_path: Path) -> Iterable[Dict]:
+        """Read JSON file
+        
+        Top-level arrays larger than JSON_STREAM_THRESHOLD are parsed
+        incrementally with ijson (if installed), so memory stays bounded by
+        the batch size rather than the file size.
+        """
+        if file_path.stat().st_size > JSON_STREAM_THRESHOLD:
+            try:
+                import ijson
+            except ImportError:
+                ijson = None
+            
+            if ijson is not None:
+                with open(file_path, 'rb') as f:
+                    is_array = f.read(1024).lstrip().startswith(b'[')
+                if is_array:
+                    return self._stream_json_array(file_path, ijson)
+        
+        with _sequential(open(file_path, 'r', encoding='utf-8')) as f:
             data = json.load(f)
         
         # Handle both single object and array
@@ -126,22 +342,92 @@ class DataImporter:
         else:
             raise GDMongoError("JSON must contain object or array")
     
-    async def _read_csv(self, file_path: Path) -> List[Dict]:
-        """Read CSV file"""
-        data = []
+    @staticmethod
+    def _stream_json_array(file_path: Path, ijson) -> Iterator[Dict]:
+        """Yield the items of a top-level JSON array one at a time"""
+        with _sequential(open(file_path, 'rb')) as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    
+    def _read_csv(self, file_path: Path, schema: Type[Schema] = None) -> Iterator[Dict]:
+        """Read CSV file
+        
+        Uses pyarrow's multithreaded reader when installed, typing columns
+        from the schema; otherwise falls back to the csv module.
+        """
+        if pa is None:
+            yield from self._read_csv_rows(file_path, schema)
+            return
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        yielded = 0
+        try:
+            for row in self._read_csv_arrow(file_path, schema):
+                yield row
+                yielded += 1
+        except pa.ArrowInvalid:
+            # Arrow infers column types from the first block and rejects
+            # later values that don't fit; finish with the csv module
+            yield from islice(self._read_csv_rows(file_path, schema), yielded, None)
+    
+    def _read_csv_rows(self, file_path: Path, schema: Type[Schema] = None) -> Iterator[Dict]:
+        """Read CSV file with the csv module
+        
+        Blank lines are skipped (as pyarrow does). Short rows are padded, so
+        missing trailing cells read as empty (None); rows with more cells
+        than the header raise GDMongoError.
+        """
+        with _sequential(open(file_path, 'r', encoding='utf-8', newline='')) as f:
+            reader = csv.reader(f)
+            header = tuple(next(reader, ()))
+            convert = _csv_row_converter(schema, header) if schema is not None else None
             for row in reader:
+                if not row:
+                    continue
+                if len(row) > len(header):
+                    raise GDMongoError(
+                        f"CSV line {reader.line_num}: expected {len(header)} columns, got {len(row)}"
+                    )
+                if len(row) < len(header):
+                    row += [''] * (len(header) - len(row))
+                
+                if convert is not None:
+                    try:
+                        yield convert(row)
+                        continue
+                    except ValueError:
+                        pass  # e.g. "3.0" in an int column - convert generically
+                
                 # Convert string values to appropriate types
-                converted_row = {}
-                for key, value in row.items():
-                    converted_row[key] = self._convert_csv_value(value)
-                data.append(converted_row)
+                yield {key: self._convert_csv_value(value) for key, value in zip(header, row)}
+    
+    def _read_csv_arrow(self, file_path: Path, schema: Type[Schema] = None) -> Iterator[Dict]:
+        """Read CSV file in record batches with pyarrow"""
+        column_types, text_columns = {}, set()
+        if schema is not None:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                header = tuple(next(csv.reader(f), ()))
+            column_types = _arrow_column_types(schema, header)
+            text_columns = {name for name in header if _field_type(schema, name) is str}
+        
+        reader = pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=8 << 20),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                strings_can_be_null=True
+            )
+        )
         
-        return data
+        for record_batch in reader:
+            for row in record_batch.to_pylist():
+                # Columns the schema doesn't type as str get the same
+                # treatment as the csv-module path (JSON arrays/objects, etc.)
+                for key, value in row.items():
+                    if isinstance(value, str) and key not in text_columns:
+                        row[key] = self._convert_csv_value(value)
+                yield row
     
-    def _convert_csv_value(self, value: str) -> Any:
+    @staticmethod
+    def _convert_csv_value(value: str) -> Any:
         """Convert CSV string value to appropriate Python type"""
         if value == '':
             return None
@@ -174,8 +460,8 @@ class DataImporter:
     
     async def _read_yaml(self, file_path: Path) -> List[Dict]:
         """Read YAML file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        with _sequential(open(file_path, 'r', encoding='utf-8')) as f:
+            data = yaml.load(f, Loader=SafeLoader)
         
         if isinstance(data, dict):
             return [data]
@@ -224,18 +510,23 @@ class DataImporter:
         else:
             return [xml_to_dict(root)]
     
-    async def _validate_data(self, data: List[Dict], schema: Type[Schema]) -> List[Dict]:
-        """Validate data against schema"""
-        validated_data = []
+    async def _validate_data(self, data: List[Dict], schema: Type[Schema], start: int = 0) -> List[Dict]:
+        """Validate data against schema
         
-        for i, item in enumerate(data):
-            try:
-                validated_item = schema(**item)
-                validated_data.append(validated_item.dict())
-            except Exception as e:
-                raise GDMongoError(f"Validation error at item {i}: {str(e)}")
+        The whole list is validated in one TypeAdapter call; rows are only
+        re-checked one by one to pinpoint the failing item.
+        """
+        try:
+            validated = schema._list_adapter().validate_python(data)
+        except PydanticValidationError as batch_error:
+            for i, item in enumerate(data):
+                try:
+                    schema(**item)
+                except Exception as e:
+                    raise GDMongoError(f"Validation error at item {start + i}: {str(e)}") from e
+            raise GDMongoError(f"Validation error: {batch_error}") from batch_error
         
-        return validated_data
+        return [item.dict() for item in validated]
     
     async def import_from_url(
         self, 
@@ -309,7 +600,7 @@ class DataExporter:
         if format not in self.supported_formats:
             raise GDMongoError(f"Unsupported format: {format}")
         
-        print(f"📤 Exporting to {file_path} ({format.upper()})...")
+        logger.info("Exporting to %s (%s)", file_path, format.upper())
         start_time = datetime.now()
         
         try:
@@ -325,20 +616,25 @@ class DataExporter:
             if limit:
                 cursor = cursor.limit(limit)
             
-            data = await cursor.to_list()
-            
             # Create directory if it doesn't exist
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Export based on format
+            # Export based on format. JSON is streamed straight from the
+            # cursor; the other formats need every document up front.
             if format == 'json':
-                await self._write_json(file_path, data)
-            elif format == 'csv':
-                await self._write_csv(file_path, data)
-            elif format in ['yaml', 'yml']:
-                await self._write_yaml(file_path, data)
-            elif format == 'xml':
-                await self._write_xml(file_path, data)
+                count = await self._write_json(
+                    file_path, cursor.batch_size(EXPORT_BATCH_SIZE)._get_cursor("async")
+                )
+            else:
+                data = await cursor.to_list()
+                count = len(data)
+                
+                if format == 'csv':
+                    await self._write_csv(file_path, data)
+                elif format in ['yaml', 'yml']:
+                    await self._write_yaml(file_path, data)
+                elif format == 'xml':
+                    await self._write_xml(file_path, data)
             
             duration = (datetime.now() - start_time).total_seconds()
             file_size = file_path.stat().st_size
@@ -346,8 +642,8 @@ class DataExporter:
             return QueryResponse(
                 success=True,
                 data={"file_path": str(file_path), "file_size": file_size},
-                count=len(data),
-                message=f"Exported {len(data)} documents ({format_file_size(file_size)}) in {duration:.2f}s",
+                count=count,
+                message=f"Exported {count} documents ({format_file_size(file_size)}) in {duration:.2f}s",
                 duration=duration * 1000
             )
         
@@ -360,16 +656,43 @@ class DataExporter:
                 duration=duration * 1000
             )
     
-    async def _write_json(self, file_path: Path, data: List[Dict]):
-        """Write data to JSON file"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+    @staticmethod
+    def _encode_json(doc: Dict) -> bytes:
+        """Encode one document as JSON bytes"""
+        if orjson is not None:
+            # ObjectId/Decimal128 go through default=str, like the json path
+            return orjson.dumps(doc, default=str, option=orjson.OPT_NAIVE_UTC)
+        return json.dumps(doc, default=_json_default, ensure_ascii=False).encode('utf-8')
+    
+    async def _write_json(self, file_path: Path, cursor) -> int:
+        """Stream documents from a Motor cursor into a JSON array file
+        
+        Documents are fetched a batch per await (to_list) rather than one
+        per __anext__, encoded as they arrive and written in
+        EXPORT_WRITE_BUFFER-sized chunks off the event loop, so memory stays
+        bounded regardless of collection size. Returns the document count.
+        """
+        count = 0
+        buffer = bytearray(b'[')
+        
+        with open(file_path, 'wb') as f:
+            while batch := await cursor.to_list(EXPORT_BATCH_SIZE):
+                for doc in batch:
+                    buffer += b',\n' if count else b'\n'
+                    buffer += self._encode_json(doc)
+                    count += 1
+                
+                if len(buffer) >= EXPORT_WRITE_BUFFER:
+                    await asyncio.to_thread(f.write, bytes(buffer))
+                    buffer.clear()
+            
+            buffer += b'\n]\n' if count else b']\n'
+            await asyncio.to_thread(f.write, bytes(buffer))
+        
+        return count
     
     async def _write_csv(self, file_path: Path, data: List[Dict]):
         """Write data to CSV file"""
-        if not data:
-            return
-        
         # Get all unique field names
         fieldnames = set()
         for item in data:
@@ -377,8 +700,9 @@ class DataExporter:
         
         fieldnames = sorted(fieldnames)
         
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+        out = io.StringIO(newline='')
+        if data:
+            writer = csv.DictWriter(out, fieldnames=fieldnames)
             writer.writeheader()
             
             for item in data:
@@ -393,6 +717,8 @@ class DataExporter:
                         flattened[key] = str(value)
                 
                 writer.writerow(flattened)
+        
+        await asyncio.to_thread(_write_all, file_path, out.getvalue().encode('utf-8'))
     
     def _flatten_dict(self, d: Dict, parent_key: str = '', sep: str = '.') -> Dict:
         """Flatten nested dictionary for CSV export"""
@@ -417,8 +743,8 @@ class DataExporter:
     
     async def _write_yaml(self, file_path: Path, data: List[Dict]):
         """Write data to YAML file"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+        payload = yaml.dump(data, Dumper=_ExportDumper, default_flow_style=False, allow_unicode=True)
+        await asyncio.to_thread(_write_all, file_path, payload.encode('utf-8'))
     
     async def _write_xml(self, file_path: Path, data: List[Dict]):
         """Write data to XML file"""
@@ -428,8 +754,8 @@ class DataExporter:
             item_element = ET.SubElement(root, "item", {"id": str(i)})
             self._dict_to_xml(item, item_element)
         
-        tree = ET.ElementTree(root)
-        tree.write(file_path, encoding='utf-8', xml_declaration=True)
+        payload = ET.tostring(root, encoding='utf-8', xml_declaration=True)
+        await asyncio.to_thread(_write_all, file_path, payload)
     
     def _dict_to_xml(self, data: Dict, parent: ET.Element):
         """Convert dictionary to XML elements"""
@@ -520,16 +846,34 @@ class DataMigrator:
         source_schema: Type[Schema],
         target_schema: Type[Schema] = None,
         transform_func: callable = None,
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        transform_fields: Dict[str, Any] = None
     ) -> QueryResponse:
-        """Migrate data from one collection to another"""
+        """Migrate data from one collection to another
+        
+        ``transform_fields`` are aggregation expressions added to every
+        document ($addFields). When both databases share a client and no
+        Python ``transform_func`` is given, the copy runs entirely on the
+        server with $merge (documents with an existing _id are replaced)
+        and documents are NOT validated against ``target_schema``; otherwise
+        documents are read, transformed and inserted in batches through
+        ``target_schema.insert``, which validates them.
+        """
         
         target_schema = target_schema or source_schema
         
+        if transform_func is None and self._same_cluster():
+            return await self._merge_collection(source_schema, target_schema, transform_fields)
+        
         try:
             # Get all data from source
-            cursor = source_schema.find()
-            total_count = await cursor.count()
+            if transform_fields:
+                cursor = source_schema._get_collection("async").aggregate(
+                    [{"$addFields": transform_fields}], batchSize=batch_size
+                )
+            else:
+                cursor = source_schema.find()
+            total_count = await source_schema.find().count()
             
             migrated_count = 0
             errors = []
@@ -565,6 +909,53 @@ class DataMigrator:
                 message="Migration failed"
             )
     
+    def _same_cluster(self) -> bool:
+        """Whether source and target DBs talk to the server through one client"""
+        return self.source_db._get_db("async").client is self.target_db._get_db("async").client
+    
+    async def _merge_collection(
+        self,
+        source_schema: Type[Schema],
+        target_schema: Type[Schema],
+        transform_fields: Dict[str, Any] = None
+    ) -> QueryResponse:
+        """Copy a collection server-side with an aggregation $merge
+        
+        Documents never pass through Python, so target_schema validation is
+        skipped; only the server-side collection validator (if any) applies.
+        """
+        start_time = datetime.now()
+        
+        try:
+            source = self.source_db._get_db("async")[source_schema._collection_name]
+            total_count = await source.count_documents({})
+            
+            pipeline = [{"$addFields": transform_fields}] if transform_fields else []
+            pipeline.append({
+                "$merge": {
+                    "into": {"db": self.target_db.database_name, "coll": target_schema._collection_name},
+                    "on": "_id",
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert"
+                }
+            })
+            await source.aggregate(pipeline).to_list(None)
+            
+            return QueryResponse(
+                success=True,
+                data={"migrated": total_count, "total": total_count, "errors": []},
+                count=total_count,
+                message=f"Migrated {total_count}/{total_count} documents",
+                duration=(datetime.now() - start_time).total_seconds() * 1000
+            )
+        
+        except Exception as e:
+            return QueryResponse(
+                success=False,
+                error=str(e),
+                message="Migration failed"
+            )
+    
     async def _batch_cursor(self, cursor, batch_size: int):
         """Yield cursor results in batches"""
         batch = []
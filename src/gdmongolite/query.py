@@ -1,80 +1,159 @@
 """Advanced query builder and cursor for gdmongolite"""
 
-from typing import Dict, List, Any, Optional, Union, Type
+from typing import Dict, List, Any, Optional, Union, Type, Tuple, get_args, get_origin
 from datetime import datetime
+from functools import lru_cache
 import asyncio
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Documents per cursor batch unless .batch_size() says otherwise
+DEFAULT_BATCH_SIZE = 1000
+
+# String fields allowed to hold at least this many characters count as "large"
+_LARGE_TEXT_LENGTH = 1000
+
+_RE_META = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+@lru_cache(maxsize=4096)
+def _literal_pattern(text: str) -> str:
+    """Escape text for use inside a $regex, skipping re.escape when it has no metacharacters"""
+    return re.escape(text) if _RE_META.search(text) else text
+
+
+# Python-style operator suffixes mapped to MongoDB query fragments
+_OPERATORS = {
+    # Comparison
+    'eq': lambda v: v,  # Direct assignment
+    'ne': lambda v: {'$ne': v},
+    'gt': lambda v: {'$gt': v},
+    'gte': lambda v: {'$gte': v},
+    'lt': lambda v: {'$lt': v},
+    'lte': lambda v: {'$lte': v},
+    'in': lambda v: {'$in': v if isinstance(v, (list, tuple)) else [v]},
+    'nin': lambda v: {'$nin': v if isinstance(v, (list, tuple)) else [v]},
+    
+    # String operations (values are literal text, not regex syntax)
+    'contains': lambda v: {'$regex': _literal_pattern(str(v)), '$options': 'i'},
+    'icontains': lambda v: {'$regex': _literal_pattern(str(v)), '$options': 'i'},
+    'startswith': lambda v: {'$regex': f'^{_literal_pattern(str(v))}', '$options': 'i'},
+    'endswith': lambda v: {'$regex': f'{_literal_pattern(str(v))}$', '$options': 'i'},
+    'regex': lambda v: {'$regex': v},
+    'iregex': lambda v: {'$regex': v, '$options': 'i'},
+    
+    # Existence
+    'exists': lambda v: {'$exists': bool(v)},
+    'isnull': lambda v: {'$exists': not bool(v)},
+    
+    # Array operations
+    'size': lambda v: {'$size': v},
+    'all': lambda v: {'$all': v if isinstance(v, (list, tuple)) else [v]},
+    'elemMatch': lambda v: {'$elemMatch': v},
+    
+    # Type checking
+    'type': lambda v: {'$type': v},
+}
+
+
+@lru_cache(maxsize=4096)
+def _compile_field_path(key: str) -> Tuple[str, Optional[str]]:
+    """Split a filter key like 'age__gte' into (field, operator)
+    
+    Returns (key, None) when the key has no known operator suffix. The cache
+    is bounded because keys can come from request bodies (e.g. /search).
+    """
+    if '__' in key:
+        field, operator = key.rsplit('__', 1)
+        if operator in _OPERATORS:
+            return field, operator
+    return key, None
+
+
+@lru_cache(maxsize=4096)  # field names may come from request bodies
+def _is_array_field(schema_class: Optional[Type], field: str) -> bool:
+    """Check whether a schema annotates a field as a list/set/tuple"""
+    model_fields = getattr(schema_class, 'model_fields', None)
+    if not model_fields or field not in model_fields:
+        return False
+    
+    annotation = model_fields[field].annotation
+    candidates = [annotation]
+    if get_origin(annotation) is Union:  # Optional[List[str]] and friends
+        candidates = [arg for arg in get_args(annotation) if arg is not type(None)]
+    
+    return any((get_origin(c) or c) in (list, set, tuple) for c in candidates)
+
+
+@lru_cache(maxsize=None)
+def _large_text_fields(schema_class: Optional[Type]) -> Tuple[str, ...]:
+    """Names of string fields whose max_length marks them as large text
+    
+    Matches FieldTypes.Description, FieldTypes.Content and similar fields.
+    """
+    model_fields = getattr(schema_class, 'model_fields', None) or {}
+    large = []
+    for name, field in model_fields.items():
+        if field.annotation is not str:
+            continue
+        for constraint in field.metadata:
+            max_length = getattr(constraint, 'max_length', None)
+            if max_length is not None and max_length >= _LARGE_TEXT_LENGTH:
+                large.append(name)
+                break
+    return tuple(large)
+
 
 class QueryBuilder:
     """Build MongoDB queries from Python-style filters"""
     
     @staticmethod
-    def build_filter(filters: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert Python-style filters to MongoDB query"""
+    def build_filter(filters: Dict[str, Any], schema_class: Optional[Type] = None) -> Dict[str, Any]:
+        """Convert Python-style filters to MongoDB query
+        
+        When schema_class is given, ``field__contains=value`` on a list field
+        becomes an array-membership match (``{field: value}``), which can use
+        a multikey index instead of scanning with a regex.
+        """
+        # Fast path: plain equality filters need no parsing
+        if not any('__' in key or key.startswith('$') for key in filters):
+            return dict(filters)
+        
         query = {}
         
         for key, value in filters.items():
-            if '__' in key:
-                field, operator = key.rsplit('__', 1)
-                
-                # Handle nested field access
-                if '.' in field:
-                    field_parts = field.split('.')
-                    field = '.'.join(field_parts)
-                
-                # Convert operators
-                mongo_op = QueryBuilder._convert_operator(operator, value)
-                if mongo_op:
-                    if field in query:
-                        if isinstance(query[field], dict):
-                            query[field].update(mongo_op)
-                        else:
-                            query[field] = {**{query[field]: query[field]}, **mongo_op}
-                    else:
-                        query[field] = mongo_op
+            if key in ('$or', '$and', '$nor') and isinstance(value, (list, tuple)):
+                # Logical operators hold sub-filters that use the same syntax
+                query[key] = [QueryBuilder.build_filter(sub, schema_class) for sub in value]
+                continue
+            
+            field, operator = _compile_field_path(key)
+            if operator is None:
+                query[key] = value
+                continue
+            
+            if operator == 'contains' and _is_array_field(schema_class, field):
+                operator = 'eq'
+            
+            # Convert operators
+            mongo_op = QueryBuilder._convert_operator(operator, value)
+            if field in query:
+                if isinstance(query[field], dict):
+                    query[field].update(mongo_op)
                 else:
-                    query[key] = value
+                    query[field] = {**{query[field]: query[field]}, **mongo_op}
             else:
-                query[key] = value
+                query[field] = mongo_op
         
         return query
     
     @staticmethod
     def _convert_operator(operator: str, value: Any) -> Optional[Dict[str, Any]]:
         """Convert Python operators to MongoDB operators"""
-        operators = {
-            # Comparison
-            'eq': lambda v: v,  # Direct assignment
-            'ne': lambda v: {'$ne': v},
-            'gt': lambda v: {'$gt': v},
-            'gte': lambda v: {'$gte': v},
-            'lt': lambda v: {'$lt': v},
-            'lte': lambda v: {'$lte': v},
-            'in': lambda v: {'$in': v if isinstance(v, (list, tuple)) else [v]},
-            'nin': lambda v: {'$nin': v if isinstance(v, (list, tuple)) else [v]},
-            
-            # String operations
-            'contains': lambda v: {'$regex': str(v), '$options': 'i'},
-            'icontains': lambda v: {'$regex': str(v), '$options': 'i'},
-            'startswith': lambda v: {'$regex': f'^{str(v)}', '$options': 'i'},
-            'endswith': lambda v: {'$regex': f'{str(v)}$', '$options': 'i'},
-            'regex': lambda v: {'$regex': v},
-            'iregex': lambda v: {'$regex': v, '$options': 'i'},
-            
-            # Existence
-            'exists': lambda v: {'$exists': bool(v)},
-            'isnull': lambda v: {'$exists': not bool(v)},
-            
-            # Array operations
-            'size': lambda v: {'$size': v},
-            'all': lambda v: {'$all': v if isinstance(v, (list, tuple)) else [v]},
-            'elemMatch': lambda v: {'$elemMatch': v},
-            
-            # Type checking
-            'type': lambda v: {'$type': v},
-        }
-        
-        if operator in operators:
-            result = operators[operator](value)
+        if operator in _OPERATORS:
+            result = _OPERATORS[operator](value)
             return result if isinstance(result, dict) else {'$eq': result}
         
         return None
@@ -82,17 +161,20 @@ class QueryBuilder:
 class Cursor:
     """Advanced cursor with chainable operations"""
     
+    # Schemas already warned about unprojected to_list() calls
+    _warned_unprojected = set()
+    
     def __init__(self, schema_class: Type, filters: Dict[str, Any]):
         self.schema_class = schema_class
         self.filters = filters
-        self.query = QueryBuilder.build_filter(filters)
+        self.query = QueryBuilder.build_filter(filters, schema_class)
         
         # Cursor options
         self._limit = None
         self._skip = None
         self._sort = None
         self._projection = None
-        self._batch_size = 1000
+        self._batch_size = None  # None = DEFAULT_BATCH_SIZE, capped by limit
         
         # Execution tracking
         self._executed = False
@@ -154,30 +236,123 @@ class Cursor:
         return self
     
     def batch_size(self, size: int) -> 'Cursor':
-        """Set batch size for cursor iteration"""
+        """Set batch size for cursor iteration
+        
+        Defaults to DEFAULT_BATCH_SIZE (or the limit, if smaller) instead of
+        the server's 101-document first batch.
+        """
         self._batch_size = size
         return self
     
     def _get_cursor(self, force_mode=None):
         """Get the MongoDB cursor"""
         collection = self.schema_class._get_collection(force_mode)
-        cursor = collection.find(self.query)
+        # Drivers take the projection as find()'s second argument
+        cursor = collection.find(self.query, self._projection or None)
         
-        if self._projection:
-            cursor = cursor.projection(self._projection)
         if self._sort:
             cursor = cursor.sort(self._sort)
         if self._skip:
             cursor = cursor.skip(self._skip)
         if self._limit:
             cursor = cursor.limit(self._limit)
-        if self._batch_size:
-            cursor = cursor.batch_size(self._batch_size)
+        # Large batches mean fewer getMore round-trips; no point fetching
+        # more per batch than the limit allows
+        batch_size = self._batch_size or min(DEFAULT_BATCH_SIZE, self._limit or DEFAULT_BATCH_SIZE)
+        cursor = cursor.batch_size(batch_size)
         
         return cursor
     
+    def _warn_unprojected(self):
+        """Warn (once per schema) when large text fields are fetched in bulk"""
+        schema_class = self.schema_class
+        if self._projection or schema_class in Cursor._warned_unprojected:
+            return
+        large = _large_text_fields(schema_class)
+        if large:
+            Cursor._warned_unprojected.add(schema_class)
+            logger.warning(
+                "%s.find().to_list() without a projection fetches large fields %s; "
+                "use .project(...) to select only the fields you need",
+                schema_class.__name__, ", ".join(large)
+            )
+    
+    def _sort_index_missing(self, index_keys: List[tuple]) -> bool:
+        """Check whether no index covers the requested sort fields"""
+        fields = tuple(field for field, _ in self._sort)
+        return not any(keys[:len(fields)] == fields for keys in index_keys)
+    
+    def _sort_on_schema_fields(self) -> bool:
+        """Check that every sort field is declared on the schema
+        
+        auto_index only creates indexes for these, since sort fields can
+        come from clients (e.g. the FastAPI CRUD routes' ``sort`` param).
+        """
+        model_fields = getattr(self.schema_class, 'model_fields', {})
+        return all(field in model_fields for field, _ in self._sort)
+    
+    def _report_unindexed_sort(self, index_keys: List[tuple]):
+        """Warn about an unindexed sort; remember it so we only warn once"""
+        fields = tuple(field for field, _ in self._sort)
+        index_keys.append(fields)
+        logger.warning(
+            "Sorting %s on unindexed field(s) %s forces an in-memory sort; "
+            "fix with: await db.%s.create_index(%r)",
+            self.schema_class._collection_name, ", ".join(fields),
+            self.schema_class.__name__, self._sort if len(fields) > 1 else fields[0]
+        )
+    
+    async def _check_sort_index(self):
+        """Warn about (or create, with db.auto_index) a missing sort index"""
+        db = self.schema_class._db
+        if not self._sort or db is None:
+            return
+        
+        try:
+            collection = self.schema_class._get_collection("async")
+            index_keys = db._index_cache.get(self.schema_class._collection_name)
+            if index_keys is None:
+                info = await collection.index_information()
+                index_keys = [tuple(field for field, _ in spec['key']) for spec in info.values()]
+                db._index_cache[self.schema_class._collection_name] = index_keys
+            
+            if self._sort_index_missing(index_keys):
+                if db.auto_index and self._sort_on_schema_fields():
+                    await collection.create_index(self._sort)
+                    index_keys.append(tuple(field for field, _ in self._sort))
+                else:
+                    self._report_unindexed_sort(index_keys)
+        except Exception as e:
+            # Index diagnostics must never break the query itself
+            logger.debug("Sort index check failed: %s", e)
+    
+    def _check_sort_index_sync(self):
+        """Sync version of _check_sort_index"""
+        db = self.schema_class._db
+        if not self._sort or db is None:
+            return
+        
+        try:
+            collection = self.schema_class._get_collection("sync")
+            index_keys = db._index_cache.get(self.schema_class._collection_name)
+            if index_keys is None:
+                info = collection.index_information()
+                index_keys = [tuple(field for field, _ in spec['key']) for spec in info.values()]
+                db._index_cache[self.schema_class._collection_name] = index_keys
+            
+            if self._sort_index_missing(index_keys):
+                if db.auto_index and self._sort_on_schema_fields():
+                    collection.create_index(self._sort)
+                    index_keys.append(tuple(field for field, _ in self._sort))
+                else:
+                    self._report_unindexed_sort(index_keys)
+        except Exception as e:
+            logger.debug("Sort index check failed: %s", e)
+    
     async def to_list(self, length: Optional[int] = None) -> List[Dict]:
         """Convert cursor to list (async)"""
+        self._warn_unprojected()
+        await self._check_sort_index()
         cursor = self._get_cursor("async")
         
         if length:
@@ -187,6 +362,8 @@ class Cursor:
     
     def to_list_sync(self, length: Optional[int] = None) -> List[Dict]:
         """Convert cursor to list (sync)"""
+        self._warn_unprojected()
+        self._check_sort_index_sync()
         cursor = self._get_cursor("sync")
         
         results = []
@@ -201,12 +378,14 @@ class Cursor:
     
     async def first(self) -> Optional[Dict]:
         """Get first document (async)"""
+        await self._check_sort_index()
         cursor = self._get_cursor("async").limit(1)
         docs = await cursor.to_list(1)
         return docs[0] if docs else None
     
     def first_sync(self) -> Optional[Dict]:
         """Get first document (sync)"""
+        self._check_sort_index_sync()
         cursor = self._get_cursor("sync").limit(1)
         try:
             return next(cursor)
@@ -214,13 +393,26 @@ class Cursor:
             return None
     
     async def count(self) -> int:
-        """Count documents matching the query (async)"""
+        """Count documents matching the query (async)
+        
+        With an empty filter this uses estimated_document_count, which reads
+        collection metadata instead of scanning. The estimate can lag behind
+        in-flight writes (and after an unclean shutdown); filter on something,
+        e.g. ``find(_id__exists=True)``, when an exact count is required.
+        """
         collection = self.schema_class._get_collection("async")
+        if not self.query:
+            return await collection.estimated_document_count()
         return await collection.count_documents(self.query)
     
     def count_sync(self) -> int:
-        """Count documents matching the query (sync)"""
+        """Count documents matching the query (sync)
+        
+        Uses estimated_document_count for an empty filter, like count().
+        """
         collection = self.schema_class._get_collection("sync")
+        if not self.query:
+            return collection.estimated_document_count()
         return collection.count_documents(self.query)
     
     async def exists(self) -> bool:
@@ -271,7 +463,7 @@ class AggregationPipeline:
     
     def match(self, **filters) -> 'AggregationPipeline':
         """Add $match stage"""
-        query = QueryBuilder.build_filter(filters)
+        query = QueryBuilder.build_filter(filters, self.schema_class)
         self.pipeline.append({'$match': query})
         return self
     
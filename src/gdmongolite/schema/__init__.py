@@ -59,11 +59,10 @@ class Order(Schema):
         ]
 
 # Register all schemas with the database
-db.register_schema(User)
-db.register_schema(Product) 
-db.register_schema(Order)
+db.register_schemas(User, Product, Order)
 
 # Now you can use:
+# await db.ensure_indexes()  # create the Config.indexes above, once at startup
 # await db.User.insert({"name": "John", "email": "john@example.com", "age": 30})
 # users = await db.User.find(age__gte=18).to_list()
 # await db.Product.update({"category": "electronics"}, {"$inc": {"rating": 0.1}})
@@ -1,4 +1,4 @@
-import asyncio
+from gdmongolite import run
 from gdmongolite.schema import db
 
 async def main():
@@ -6,10 +6,10 @@ async def main():
     await db.User.insert({"name":"Alice","email":"a@b.com","age":28})
     print("Inserted user: Alice")
     
-    users_cursor = db.User.find(age__gte=18)
+    users_cursor = db.User.find(age__gte=18).batch_size(100)
     users = await users_cursor.to_list(length=100)
     print("Found users (age >= 18):")
     print(users)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -1,13 +1,13 @@
-import asyncio
 import app
+from gdmongolite import run
 from gdmongolite.schema import db
 
 async def main():
     print("Executing database commands with telemetry...")
-    users_cursor = db.User.find(age__gte=18)
+    users_cursor = db.User.find(age__gte=18).batch_size(100)
     users = await users_cursor.to_list(length=100)
     print("Found users (age >= 18):")
     print(users)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
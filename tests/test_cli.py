@@ -1,8 +1,19 @@
+import click
+import pytest
 from click.testing import CliRunner
 from gdmongolite.cli import main
 
-def test_cli_base():
-    runner = CliRunner()
-    result = runner.invoke(main, ['--help'])
+
+@pytest.fixture(scope="module")
+def runner():
+    return CliRunner()
+
+
+def test_cli_base(runner):
+    result = runner.invoke(main, ['--help'], catch_exceptions=False)
     assert result.exit_code == 0
     assert "gdmongolite" in result.output
+
+
+def test_cli_help_text():
+    assert "gdmongolite" in main.get_help(click.Context(main))
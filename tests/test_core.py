@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from gdmongolite import DB
+
+
+def test_db_instances_share_client_per_uri():
+    async def clients():
+        source = DB("mongodb://localhost:27017", "source_db", mode="async")
+        target = DB("mongodb://localhost:27017", "target_db", mode="async")
+        other = DB("mongodb://otherhost:27017", "source_db", mode="async")
+        for db in (source, target, other):
+            db._get_db()
+        try:
+            return source._async_client, target._async_client, other._async_client
+        finally:
+            for db in (source, target, other):
+                await db.close()
+
+    source, target, other = asyncio.run(clients())
+    assert source is target
+    assert source is not other
+
+
+def test_closing_one_db_keeps_shared_client_usable(monkeypatch):
+    # Nothing listens on port 1, so a live client times out on server
+    # selection; a closed one would raise InvalidOperation instead
+    monkeypatch.setitem(DB._default_config, "timeout_ms", 50)
+    uri = "mongodb://localhost:1"
+
+    async def query_after_close():
+        source = DB(uri, "source_db", mode="async")
+        target = DB(uri, "target_db", mode="async")
+        source._get_db()
+        target._get_db()
+        await source.close()
+        try:
+            with pytest.raises(ServerSelectionTimeoutError):
+                await target._get_db()["items"].find_one()
+        finally:
+            await target.close()
+        return [entry for clients in DB._async_clients.values() for entry in clients]
+
+    assert uri not in asyncio.run(query_after_close())
+
+    source = DB(uri, "source_db", mode="sync")
+    target = DB(uri, "target_db", mode="sync")
+    source._get_db(), target._get_db()
+    source.close_sync()
+    with pytest.raises(ServerSelectionTimeoutError):
+        target._get_db()["items"].find_one()
+    target.close_sync()
+    assert uri not in DB._sync_clients
+
+
+def test_run_closes_clients_it_opened():
+    from gdmongolite import run
+
+    async def main():
+        db = DB("mongodb://localhost:27017", "run_db", mode="async")
+        db._get_db()
+        return db._async_client
+
+    client = run(main(), client_uri="mongodb://localhost:27017")
+    assert all(
+        client is not entry[0]
+        for clients in DB._async_clients.values()
+        for entry in clients.values()
+    )
+
+
+class _FakeSyncInsertCollection:
+    """Collection stub whose insert_many fails for documents named "bad" """
+
+    def __init__(self):
+        self.calls = 0
+
+    def insert_many(self, docs, ordered=True):
+        from pymongo.errors import BulkWriteError
+        from pymongo.results import InsertManyResult
+
+        self.calls += 1
+        for doc in docs:
+            doc["_id"] = doc["name"]
+        failed = [i for i, doc in enumerate(docs) if doc["name"] == "bad"]
+        if failed:
+            if ordered:
+                failed = failed[:1]
+            raise BulkWriteError({"writeErrors": [{"index": i, "errmsg": "duplicate"} for i in failed]})
+        return InsertManyResult([doc["_id"] for doc in docs], True)
+
+
+class _FakeInsertCollection(_FakeSyncInsertCollection):
+    async def insert_many(self, docs, ordered=True):
+        return super().insert_many(docs, ordered)
+
+
+def _patch_collection(monkeypatch, schema, collection_class=_FakeInsertCollection):
+    collection = collection_class()
+    monkeypatch.setattr(schema, "_get_collection", classmethod(lambda cls, mode=None: collection))
+    return collection
+
+
+def test_insert_ordered_stops_at_first_failing_chunk(monkeypatch):
+    from gdmongolite import Schema
+
+    class Tag(Schema):
+        name: str
+
+    collection = _patch_collection(monkeypatch, Tag)
+    docs = [{"name": n} for n in ("a", "b", "bad", "c", "d", "e")]
+    response = asyncio.run(Tag.insert(docs, chunk_size=2, ordered=True))
+    assert not response.success
+    assert response.data == ["a", "b"]
+    assert collection.calls == 2
+
+
+def test_insert_unordered_reports_partial_ids(monkeypatch):
+    from gdmongolite import Schema
+
+    class Tag(Schema):
+        name: str
+
+    _patch_collection(monkeypatch, Tag)
+    docs = [{"name": n} for n in ("a", "b", "bad", "c", "d", "e")]
+    response = asyncio.run(Tag.insert(docs, chunk_size=2))
+    assert not response.success
+    assert sorted(response.data) == ["a", "b", "c", "d", "e"]
+    assert response.count == 5
+
+
+def test_insert_sync_unordered_reports_partial_ids(monkeypatch):
+    from gdmongolite import Schema
+
+    class Tag(Schema):
+        name: str
+
+    collection = _patch_collection(monkeypatch, Tag, _FakeSyncInsertCollection)
+    docs = [{"name": n} for n in ("a", "b", "bad", "c", "d", "e")]
+    response = Tag.insert_sync(docs, chunk_size=2)
+    assert not response.success
+    assert response.data == ["a", "b", "c", "d", "e"]
+    assert response.count == 5
+    assert "duplicate" in response.error
+
+    collection.calls = 0
+    response = Tag.insert_sync(docs, chunk_size=2, ordered=True)
+    assert response.data == ["a", "b"]
+    assert collection.calls == 2
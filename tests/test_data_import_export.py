@@ -0,0 +1,252 @@
+import asyncio
+import json
+from typing import Optional
+
+import pytest
+
+from gdmongolite import Schema, FieldTypes, GDMongoError
+from gdmongolite.integrations.data_import_export import DataImporter
+
+
+class Item(Schema):
+    name: FieldTypes.Name
+    price: FieldTypes.Price
+
+
+def test_validate_data_batch():
+    importer = DataImporter(db=None)
+    rows = [{"name": "Pen", "price": 1.5}, {"name": "Ink", "price": "2"}]
+    assert asyncio.run(importer._validate_data(rows, Item)) == [
+        {"name": "Pen", "price": 1.5},
+        {"name": "Ink", "price": 2.0},
+    ]
+
+
+def test_validate_data_reports_failing_row():
+    importer = DataImporter(db=None)
+    rows = [{"name": "Pen", "price": 1.5}, {"name": "Ink", "price": -1}]
+    with pytest.raises(GDMongoError, match="item 1"):
+        asyncio.run(importer._validate_data(rows, Item))
+
+
+def test_write_json_streams_valid_array(tmp_path):
+    from gdmongolite.integrations.data_import_export import DataExporter, EXPORT_BATCH_SIZE
+
+    class FakeCursor:
+        def __init__(self, docs):
+            self.docs = docs
+
+        async def to_list(self, length):
+            batch, self.docs = self.docs[:length], self.docs[length:]
+            return batch
+
+    exporter = DataExporter(db=None)
+    path = tmp_path / "out.json"
+    docs = [{"name": f"Pen {i}"} for i in range(EXPORT_BATCH_SIZE + 1)]
+
+    assert asyncio.run(exporter._write_json(path, FakeCursor(list(docs)))) == len(docs)
+    assert json.loads(path.read_text()) == docs
+
+    assert asyncio.run(exporter._write_json(path, FakeCursor([]))) == 0
+    assert json.loads(path.read_text()) == []
+
+
+def test_read_csv_casts_schema_columns(tmp_path, monkeypatch):
+    from gdmongolite.integrations import data_import_export
+
+    class Flagged(Schema):
+        name: str
+        price: Optional[float] = None
+        active: bool = False
+
+    monkeypatch.setattr(data_import_export, "pa", None)  # csv module path
+    path = tmp_path / "items.csv"
+    path.write_text(
+        'name,price,tags,active\n007,1.5,"[""a""]",1\nInk,,,0\nPad,2,,yes\n',
+        encoding="utf-8",
+    )
+    importer = DataImporter(db=None)
+    rows = list(importer._read_csv(path, Flagged))
+    assert rows == [
+        {"name": "007", "price": 1.5, "tags": ["a"], "active": 1},
+        {"name": "Ink", "price": None, "tags": None, "active": 0},
+        {"name": "Pad", "price": 2.0, "tags": None, "active": "yes"},
+    ]
+    validated = asyncio.run(importer._validate_data(rows, Flagged))
+    assert [row["active"] for row in validated] == [True, False, True]
+
+
+def test_read_csv_arrow_accepts_loose_values(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    class Stock(Schema):
+        sku: str
+        quantity: int
+        active: bool
+
+    path = tmp_path / "stock.csv"
+    path.write_text("sku,quantity,active\n007,3.0,yes\n008,2,0\n", encoding="utf-8")
+    importer = DataImporter(db=None)
+    validated = asyncio.run(importer._validate_data(list(importer._read_csv(path, Stock)), Stock))
+    assert validated == [
+        {"sku": "007", "quantity": 3, "active": True},
+        {"sku": "008", "quantity": 2, "active": False},
+    ]
+
+
+def test_read_csv_falls_back_after_arrow_error(tmp_path, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+
+    def failing_arrow(file_path, schema=None):
+        yield {"name": "Pen", "price": 1.5}
+        raise pa.ArrowInvalid("CSV conversion error to int64: invalid value '3.0'")
+
+    path = tmp_path / "items.csv"
+    path.write_text("name,price\nPen,1.5\nInk,3.0\n", encoding="utf-8")
+    importer = DataImporter(db=None)
+    monkeypatch.setattr(importer, "_read_csv_arrow", failing_arrow)
+    assert list(importer._read_csv(path, Item)) == [
+        {"name": "Pen", "price": 1.5},
+        {"name": "Ink", "price": 3.0},
+    ]
+
+
+def test_import_unacknowledged_skips_bypass_document_validation(tmp_path, monkeypatch):
+    from pymongo import WriteConcern
+
+    class FakeResult:
+        def __init__(self, docs):
+            self.inserted_ids = list(range(len(docs)))
+
+    class FakeCollection:
+        write_concern = WriteConcern()
+
+        def with_options(self, write_concern):
+            self.write_concern = write_concern
+            return self
+
+        async def insert_many(self, docs, ordered=True, bypass_document_validation=None):
+            if bypass_document_validation is not None and not self.write_concern.acknowledged:
+                raise ValueError("Cannot set bypass_document_validation with unacknowledged write concern")
+            return FakeResult(docs)
+
+    monkeypatch.setattr(Item, "_get_collection", classmethod(lambda cls, mode=None: FakeCollection()))
+    path = tmp_path / "items.json"
+    path.write_text('[{"name": "Pen", "price": 1.5}, {"name": "Ink", "price": 2}]', encoding="utf-8")
+
+    response = asyncio.run(DataImporter(db=None).import_from_file(path, Item, write_concern=WriteConcern(w=0)))
+    assert response.success
+    assert response.count == 2
+
+
+def test_import_skips_batch_that_fails_validation(tmp_path, monkeypatch):
+    from pymongo import WriteConcern
+
+    class FakeResult:
+        def __init__(self, docs):
+            self.inserted_ids = list(range(len(docs)))
+
+    class FakeCollection:
+        write_concern = WriteConcern()
+
+        def with_options(self, write_concern):
+            raise AssertionError("the default import must keep the collection's write concern")
+
+        async def insert_many(self, docs, ordered=True, **kwargs):
+            return FakeResult(docs)
+
+    monkeypatch.setattr(Item, "_get_collection", classmethod(lambda cls, mode=None: FakeCollection()))
+    rows = [{"name": "Pen", "price": 1.5}, {"name": "Ink", "price": -1}, {"name": "Pad", "price": 2}]
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(rows), encoding="utf-8")
+
+    response = asyncio.run(DataImporter(db=None).import_from_file(path, Item, batch_size=1))
+    assert not response.success
+    assert response.count == 2
+    assert "item 1" in response.data["errors"][0]
+
+
+def test_encode_json_same_with_and_without_orjson(monkeypatch):
+    from datetime import date, datetime, timedelta, timezone
+
+    from bson import ObjectId
+
+    from gdmongolite.integrations import data_import_export
+    from gdmongolite.integrations.data_import_export import DataExporter
+
+    pytest.importorskip("orjson")
+    doc = {
+        "_id": ObjectId("64b7f0c2a1b2c3d4e5f60718"),
+        "naive": datetime(2024, 1, 1, 12, 30, 0, 123456),
+        "aware": datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        "day": date(2024, 1, 1),
+        "name": "Café",
+    }
+    with_orjson = DataExporter._encode_json(doc)
+    monkeypatch.setattr(data_import_export, "orjson", None)
+    without_orjson = DataExporter._encode_json(doc)
+
+    assert json.loads(with_orjson) == json.loads(without_orjson)
+    assert json.loads(without_orjson)["naive"] == "2024-01-01T12:30:00.123456+00:00"
+
+
+def test_write_yaml_handles_bson_types(tmp_path):
+    import uuid
+
+    import yaml
+    from bson import Binary, Decimal128, Int64, ObjectId
+
+    from gdmongolite.integrations.data_import_export import DataExporter
+
+    doc = {
+        "_id": ObjectId("64b7f0c2a1b2c3d4e5f60718"),
+        "views": Int64(2**40),
+        "price": Decimal128("1.5"),
+        "token": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "blob": Binary(b"\x00\x01"),
+    }
+    path = tmp_path / "out.yaml"
+    asyncio.run(DataExporter(db=None)._write_yaml(path, [doc]))
+
+    [loaded] = yaml.safe_load(path.read_text(encoding="utf-8"))
+    assert loaded["_id"] == "64b7f0c2a1b2c3d4e5f60718"
+    assert loaded["views"] == 2**40
+    assert loaded["price"] == "1.5"
+    assert loaded["token"] == "12345678-1234-5678-1234-567812345678"
+    assert isinstance(loaded["blob"], str)
+
+
+def test_read_csv_rows_skips_blank_lines_and_pads_short_rows(tmp_path):
+    path = tmp_path / "items.csv"
+    path.write_text("name,price\nPen,1.5\n\nInk\n\n", encoding="utf-8")
+    rows = list(DataImporter(db=None)._read_csv_rows(path, Item))
+    assert rows == [{"name": "Pen", "price": 1.5}, {"name": "Ink", "price": None}]
+
+    path.write_text("name,price\nPen,1.5,extra\n", encoding="utf-8")
+    with pytest.raises(GDMongoError, match="line 2"):
+        list(DataImporter(db=None)._read_csv_rows(path, Item))
+
+
+def test_read_csv_arrow_and_csv_module_agree_on_blank_lines(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    path = tmp_path / "items.csv"
+    path.write_text("name,price\nPen,1.5\n\nInk,2\n\n", encoding="utf-8")
+    importer = DataImporter(db=None)
+    assert list(importer._read_csv(path, Item)) == list(importer._read_csv_rows(path, Item))
+
+
+def test_read_csv_arrow_and_csv_module_agree_on_untyped_columns(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    class Event(Schema):
+        code: Optional[str] = None
+        when: Optional[str] = None
+
+    path = tmp_path / "events.csv"
+    path.write_text("code,when,note\n007,2023-01-15,2023-01-16\n", encoding="utf-8")
+    importer = DataImporter(db=None)
+    rows = list(importer._read_csv_arrow(path, Event))
+    assert rows == list(importer._read_csv_rows(path, Event))
+    assert rows == [{"code": "007", "when": "2023-01-15", "note": "2023-01-16"}]
+    assert asyncio.run(importer._validate_data(rows, Event))
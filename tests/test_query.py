@@ -0,0 +1,195 @@
+from gdmongolite.query import QueryBuilder
+
+
+def test_build_filter_equality():
+    assert QueryBuilder.build_filter({"name": "Alice"}) == {"name": "Alice"}
+
+
+def test_build_filter_operators():
+    query = QueryBuilder.build_filter({"age__gte": 18, "age__lt": 65, "_id__in": [1, 2]})
+    assert query == {"age": {"$gte": 18, "$lt": 65}, "_id": {"$in": [1, 2]}}
+
+
+def test_build_filter_unknown_operator_kept_verbatim():
+    assert QueryBuilder.build_filter({"first__name": "Bob"}) == {"first__name": "Bob"}
+
+
+def test_contains_on_list_field_uses_array_membership():
+    from gdmongolite import Schema
+
+    class Article(Schema):
+        title: str
+        tags: list[str] = []
+
+    query = QueryBuilder.build_filter({"tags__contains": "python", "title__contains": "py"}, Article)
+    assert query["tags"] == {"$eq": "python"}
+    assert query["title"] == {"$regex": "py", "$options": "i"}
+
+
+def test_build_filter_compiles_logical_subfilters():
+    query = QueryBuilder.build_filter({"$or": [{"age__lt": 18}, {"name__startswith": "A"}]})
+    assert query == {"$or": [{"age": {"$lt": 18}}, {"name": {"$regex": "^A", "$options": "i"}}]}
+
+
+def test_large_text_fields_detected():
+    from gdmongolite import Schema, FieldTypes
+    from gdmongolite.query import _large_text_fields
+
+    class Note(Schema):
+        title: FieldTypes.Title
+        body: FieldTypes.Content
+
+    assert _large_text_fields(Note) == ("body",)
+
+
+def test_sort_index_missing():
+    from gdmongolite import Schema
+    from gdmongolite.query import Cursor
+
+    class Event(Schema):
+        kind: str
+
+    cursor = Cursor(Event, {}).sort("kind", "-_id")
+    assert not cursor._sort_index_missing([("_id",), ("kind", "_id", "extra")])
+    assert cursor._sort_index_missing([("_id",), ("kind",)])
+
+
+def test_string_operators_match_literal_text():
+    query = QueryBuilder.build_filter({"email__contains": "a.b+c", "name__startswith": "Al"})
+    assert query["email"] == {"$regex": r"a\.b\+c", "$options": "i"}
+    assert query["name"] == {"$regex": "^Al", "$options": "i"}
+
+
+def test_auto_index_only_for_schema_fields():
+    from gdmongolite import Schema
+    from gdmongolite.query import Cursor
+
+    class Event(Schema):
+        title: str
+
+    assert Cursor(Event, {}).sort(title=1)._sort_on_schema_fields()
+    assert not Cursor(Event, {}).sort(password_hash=1)._sort_on_schema_fields()
+
+
+def test_create_index_invalidates_index_cache(monkeypatch):
+    from gdmongolite import DB, Schema
+
+    class Event(Schema):
+        title: str
+
+    class FakeCollection:
+        def create_index(self, keys, **kwargs):
+            return "title_1"
+
+    db = DB("mongodb://localhost:27017", "index_db")
+    db.register_schema(Event)
+    db._index_cache[Event._collection_name] = [("_id",)]
+    monkeypatch.setattr(Event, "_get_collection", classmethod(lambda cls, mode=None: FakeCollection()))
+
+    assert Event.create_index_sync("title") == "title_1"
+    assert Event._collection_name not in db._index_cache
+
+
+class _FakeDriverCursor:
+    """Stand-in for a Motor cursor over an in-memory list"""
+
+    def __init__(self, docs, projection):
+        fields = [field for field, include in (projection or {}).items() if include]
+        self.docs = [{k: v for k, v in doc.items() if k in fields} if fields else doc for doc in docs]
+        self._iter = iter(self.docs)
+
+    def batch_size(self, size):
+        self.size = size
+        return self
+
+    def sort(self, spec):
+        for field, direction in reversed(spec):
+            self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.docs[:length] if length else list(self.docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class _FakeFindCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.projections = []
+
+    def find(self, query, projection=None):
+        self.projections.append(projection)
+        self.cursor = _FakeDriverCursor(self.docs, projection)
+        return self.cursor
+
+
+def _projected_product(monkeypatch):
+    from gdmongolite import Schema
+
+    class Product(Schema):
+        name: str
+        price: float
+        description: str = ""
+
+    collection = _FakeFindCollection([{"name": "Pen", "price": 1.5, "description": "Blue ink"}])
+    monkeypatch.setattr(Product, "_get_collection", classmethod(lambda cls, mode=None: collection))
+    return Product, collection
+
+
+def test_projected_cursor_can_be_iterated(monkeypatch):
+    import asyncio
+
+    Product, collection = _projected_product(monkeypatch)
+
+    async def collect():
+        return [doc async for doc in Product.find().project("name", "price")]
+
+    assert asyncio.run(collect()) == [{"name": "Pen", "price": 1.5}]
+    assert collection.projections == [{"name": 1, "price": 1}]
+
+
+def test_projected_cursor_streams_with_batch_size(monkeypatch):
+    import asyncio
+
+    Product, collection = _projected_product(monkeypatch)
+
+    async def collect():
+        cursor = Product.find(name__in=["Pen"]).project("name", "price").batch_size(500)
+        return {doc["name"]: doc["price"] async for doc in cursor}
+
+    assert asyncio.run(collect()) == {"Pen": 1.5}
+    assert collection.cursor.size == 500
+
+
+def test_projected_to_list_with_sort_and_limit(monkeypatch, caplog):
+    import asyncio
+
+    from gdmongolite import Schema
+    from pydantic import Field
+
+    class Post(Schema):
+        title: str
+        content: str = Field("", max_length=10_000)
+        created_at: int = 0
+
+    collection = _FakeFindCollection([
+        {"title": "Old", "content": "...", "created_at": 1},
+        {"title": "New", "content": "...", "created_at": 2},
+    ])
+    monkeypatch.setattr(Post, "_get_collection", classmethod(lambda cls, mode=None: collection))
+
+    posts = asyncio.run(Post.find().project("title", "created_at").sort("-created_at").limit(1).to_list())
+    assert posts == [{"title": "New", "created_at": 2}]
+    assert "without a projection" not in caplog.text